@@ -1,25 +1,10 @@
-import base64
-from datetime import datetime
-import os
 import streamlit as st
-import pandas as pd
-import numpy as np
-import joblib
-import time
-import altair as alt
-
-@st.cache_resource
-def load_model_and_scalers():
-    model = joblib.load('alzheimers_model.pkl') 
-    scalers = None
-    if os.path.exists('scalers.joblib'):
-        try:
-            scalers = joblib.load('scalers.joblib')  
-        except Exception:
-            scalers = None
-    return model, scalers
-
-model, scalers = load_model_and_scalers()
+from batch_upload import render_batch_upload
+from diagnostics import StageTimer, render_diagnostics
+from report_download import PURPLE, render_report_download
+import report_store
+import report_templates
+import warmup
 
 user_name = st.session_state.get("user_name", "").strip()
 
@@ -134,6 +119,8 @@ st.markdown(
 
 st.caption("This tool is for educational purposes only and does not provide a medical diagnosis. Results should be interpreted in conjunction with clinical evaluation.")
 
+render_batch_upload("alzheimer", "Alzheimer's", "alzheimers_disease_data.csv")
+
 
 
 with st.expander("Personal Informations", expanded=True):
@@ -263,8 +250,19 @@ if st.button("Predict"):
     if validate_inputs(gender_code_for_model, ethnicity, edu):
 
         try:
-            with st.spinner("Making prediction..."):
-                time.sleep(1.2)
+            if not warmup.is_ready("alzheimer"):
+                with st.spinner("Loading the model for the first time since the app started..."):
+                    warmup.wait("alzheimer")
+
+            # Heavy imports and the model wait for the first prediction so the
+            # page's form paints without them.
+            import pandas as pd
+            import model_registry
+            import prediction_cache
+            import result_charts
+
+            scalers = model_registry.load("alzheimer")["scalers"]
+            timer = StageTimer()
 
             gender_for_model = gender_code_for_model
 
@@ -292,18 +290,19 @@ if st.button("Predict"):
                 'BehavioralProblems': beh,
                 'ADL': adl
             }], columns=INPUT_COLUMNS)
+            timer.lap("encode")
 
             if scalers is not None:
                 cols = scalers.get('columns', NUMERIC_COLUMNS_SCALED)
                 if 'minmax' in scalers:
                     X_user[cols] = scalers['minmax'].transform(X_user[cols])
-                elif 'standard' in scalers:
+                if 'standard' in scalers:
                     X_user[cols] = scalers['standard'].transform(X_user[cols])
+            timer.lap("scale")
 
-
-            prediction = model.predict(X_user)
-            probabilities = model.predict_proba(X_user)
-            risk_prob = float(probabilities[0][1])
+            prediction, probabilities = prediction_cache.predict("alzheimer", X_user)
+            risk_prob = float(probabilities[0])
+            timer.lap("predict")
             risk_pct = int(round(risk_prob * 100))
 
             if prediction[0] == 0:
@@ -442,36 +441,8 @@ if st.button("Predict"):
 
             max_y = raw_df['Value'].max() * 1.2
 
-            base_chart = alt.Chart(raw_df).mark_bar().encode(
-                x=alt.X('Feature:N', sort='-y'),
-                y=alt.Y('Value:Q', scale=alt.Scale(domain=[0, max_y])),
-                color=alt.Color('Color:N', scale=None),
-                tooltip=['Feature', 'Value', 'Normal Range']
-            )
-
-            text = base_chart.mark_text(
-                align='center',
-                baseline='bottom',
-                dy=-5,
-                color='black'
-            ).encode(
-                text=alt.Text('Value', format='.1f')
-            )
-
-            normal_text = alt.Chart(raw_df).mark_text(
-                align='center',
-                baseline='top',
-                dy=10,
-                fontSize=11,
-                color='#666'
-            ).encode(
-                x='Feature:N',
-                y=alt.value(0),
-                text='Normal Range:N'
-            )
-
-            final_chart = base_chart + text + normal_text
-            st.altair_chart(final_chart, use_container_width=True)
+            result_charts.show("alzheimer", raw_df, max_y=max_y)
+            timer.lap("render")
 
             advice_list = []
          
@@ -597,153 +568,43 @@ if st.button("Predict"):
                 adl_class   = "warning"
                 advice_list.append("You may need assistance with daily living activities.")
 
-            advice_html = "".join(f"<li>{item}</li>" for item in advice_list)
-
-            report_html = f"""
-            <html>
-            <head>
-            <style>
-            body {{
-                font-family: Arial, sans-serif;
-                line-height: 1.6;
-                padding: 20px;
-                display: flex;
-                flex-direction: column;
-                justify-content: center;
-                align-items: center;
-                min-height: 100vh;
-                text-align: center;
-            }}
-            h2 {{
-                color: #2E86C1;
-            }}
-            h3 {{
-                color: {'green' if prediction[0] == 0 else 'red'};
-            }}
-            .section {{
-                    margin-bottom: 20px;
-                    width: 100%;
-                    max-width: 600px;
-                }}
-            .section ul {{
-                    list-style-position: inside;  
-                    padding: 0;
-                    margin: 0 auto;
-                    display: inline-block;    
-                    text-align: left;         
-            }}
-            .success {{ color: green; }}
-            .warning {{ color: orange; }}
-            .error {{ color: red; }}
-            ul {{
-                list-style-type: none;
-                padding: 0;
-                text-align: left;
-            }}
-            li {{
-                margin-bottom: 10px;
-            }}
-            </style>
-            </head>
-            <body>
-            <h2>Alzheimer Risk Report</h2>
-            <h3>{'✅ No Alzheimer ✅' if prediction[0]==0 else '⚠️ Alzheimer Detected ⚠️'}</h3>
-
-            <div class="section">
-                    {f'<p style="margin:0; padding:0;"><b>Ad:</b> {user_name}</p>' if user_name else ""}
-                    <b>Age:</b> {age} <br>
-                    <b>Gender:</b> {user_gender}
-            </div>
-                    <h3>Health Status</h3>,
-            <ul> 
-                <li><span class="{risk_class}">{risk_text}</span></li>
-                <li><span class="{age_class}">{age_comment}</span></li>
-                <li><span class="{mmse_class}">{mmse_comment}</span></li>
-                <li><span class="{dep_class}">{dep_comment}</span></li>
-                <li><span class="{chol_total_class}">{chol_total_comment}</span></li>
-                <li><span class="{chol_hdl_class}">{chol_hdl_comment}</span></li>
-                <li><span class="{chol_ldl_class}">{chol_ldl_comment}</span></li>
-                <li><span class="{chol_tg_class}">{chol_tg_comment}</span></li>
-                <li><span class="{bp_class}">{bp_comment}</span></li>
-                <li><span class="{activity_class}">{activity_comment}</span></li>
-                <li><span class="{diet_class}">{diet_comment}</span></li>
-                <li><span class="{memc_class}">{memc_comment}</span></li>
-                <li><span class="{beh_class}">{beh_comment}</span></li>
-                <li><span class="{func_class}">{func_comment}</span></li>
-                <li><span class="{adl_class}">{adl_comment}</span></li>
-            </ul>
-            
-            <div class="section">
-                    <h3 style="margin:0; padding:0;">Personalized Recommendations for {user_name}</h3>
-                    <ul>
-             {advice_html}
-                    </ul>
-            </div>
-
-            <h3>General Health Recommendations</h3>
-            <ul>
-                <li>Do at least 150 minutes of moderate exercise per week.</li>
-                <li>Adopt healthy eating habits, such as the Mediterranean diet.</li>
-                <li>Have regular memory and cognitive function tests.</li>
-                <li>Keep your blood pressure and cholesterol under control.</li>
-                <li>Seek professional support for depression and anxiety.</li>
-                <li>Engage in social activities and mental exercises.</li>
-                <li>Get assistance if you need help with daily living activities.</li>
-                <li>Have regular check-ups to detect early signs of Alzheimer’s.</li>
-            </ul>
-            </body>
-            </html>
-
-            """
-
-            b64_report = base64.b64encode(report_html.encode()).decode()
-            href = f'data:text/html;base64,{b64_report}'
-
-            disease_type = "Alzheimer"
-
-            if "all_reports" not in st.session_state:
-                st.session_state["all_reports"] = {}
-            if disease_type not in st.session_state["all_reports"]:
-                st.session_state["all_reports"][disease_type] = []
-
-            st.session_state["all_reports"][disease_type].append({
-                "user_name": user_name or "Bilinmeyen",
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "html": report_html
-            })
+            result = report_templates.ReportResult(
+                disease="alzheimer",
+                prediction=prediction[0],
+                probability=risk_prob,
+                statuses=[
+                    (risk_class, risk_text),
+                    (age_class, age_comment),
+                    (mmse_class, mmse_comment),
+                    (dep_class, dep_comment),
+                    (chol_total_class, chol_total_comment),
+                    (chol_hdl_class, chol_hdl_comment),
+                    (chol_ldl_class, chol_ldl_comment),
+                    (chol_tg_class, chol_tg_comment),
+                    (bp_class, bp_comment),
+                    (activity_class, activity_comment),
+                    (diet_class, diet_comment),
+                    (memc_class, memc_comment),
+                    (beh_class, beh_comment),
+                    (func_class, func_comment),
+                    (adl_class, adl_comment),
+                ],
+                advice=advice_list,
+                user_name=user_name,
+                age=age,
+                gender=user_gender,
+            )
+            report_id = report_store.store.add(
+                st.session_state.setdefault("report_session", report_store.new_session_id()),
+                user_name,
+                result,
+            )
 
             safe_user_name = user_name.lower().replace(" ", "_") if user_name else "user"
             file_name = f"{safe_user_name}_alzheimer_report.html"
-            b64_report = base64.b64encode(report_html.encode()).decode()
-            href = f'data:text/html;base64,{b64_report}'
-
-            st.markdown(f"""
-                <div style="text-align: center; margin-top: 40px; animation: fadeIn 3s;">
-                    <a href="{href}" download="{file_name}" style="
-                        background: linear-gradient(90deg, #8E24AA, #CE93D8);
-                        color: white;
-                        padding: 14px 30px;
-                        font-size: 18px;
-                        font-weight: bold;
-                        border-radius: 12px;
-                        text-decoration: none;
-                        box-shadow: 3px 3px 10px rgba(0,0,0,0.2);
-                        transition: 0.3s;
-                        display: inline-block;
-                    ">
-                    Alzheimer Risk Report 📥
-                    </a>
-                </div>
-            """, unsafe_allow_html=True)
-
-            st.markdown("""
-            <style>
-            @keyframes fadeIn {
-                from { opacity: 0; transform: translateY(10px); }
-                to { opacity: 1; transform: translateY(0); }
-            }
-            </style>
-            """, unsafe_allow_html=True)
+            render_report_download(report_id, file_name, "Alzheimer Risk Report 📥", PURPLE)
+            timer.lap("report")
+            render_diagnostics(timer)
 
         except Exception as e:
             st.error(f"❌ An error occurred: {e}")
@@ -0,0 +1,334 @@
+import streamlit as st
+from diagnostics import StageTimer, render_diagnostics
+import warmup
+
+user_name = st.session_state.get("user_name", "").strip()
+user_gender = st.session_state.get("user_gender", "Select")
+
+DISEASE_LABELS = {
+    "heart": "Heart Disease",
+    "diabetes": "Diabetes",
+    "parkinson": "Parkinson's",
+    "thyroid": "Thyroid Cancer",
+    "alzheimer": "Alzheimer's",
+}
+LABEL_TO_DISEASE = {label: disease for disease, label in DISEASE_LABELS.items()}
+
+YESNO_TO_CODE = {"No": 0, "Yes": 1}
+ETHNICITY_TO_CODE = {"Caucasian": 0, "African American": 1, "Asian": 2, "Other": 3}
+EDU_TO_CODE = {"None": 0, "High School": 1, "Bachelor's": 2, "Higher": 3}
+
+PARKINSON_RANGES = {
+    'MDVP:Fo(Hz)': (50.0, 250.0),
+    'MDVP:Fhi(Hz)': (50.0, 300.0),
+    'MDVP:Jitter(%)': (0.0, 0.02),
+    'MDVP:Jitter(Abs)': (0.0, 0.01),
+    'MDVP:RAP': (0.0, 0.01),
+    'MDVP:PPQ': (0.0, 0.01),
+    'MDVP:Shimmer': (0.0, 0.1),
+    'Shimmer:APQ3': (0.0, 0.1),
+    'Shimmer:APQ5': (0.0, 0.1),
+    'MDVP:APQ': (0.0, 0.1),
+    'NHR': (0.0, 0.2),
+    'HNR': (0.0, 40.0),
+    'RPDE': (0.0, 1.0),
+    'DFA': (0.0, 2.0),
+    'spread1': (-10.0, 10.0),
+    'spread2': (-5.0, 5.0),
+    'D2': (0.0, 5.0),
+    'PPE': (0.0, 2.0)
+}
+
+
+def validate_inputs(selected_diseases, selections):
+    if user_gender not in ["Female", "Male"]:
+        st.warning("Please select your gender on the main page.", icon="⚠️")
+        return False
+    if not selected_diseases:
+        st.warning("Please choose at least one assessment!", icon="⚠️")
+        return False
+    if "Select" in selections:
+        st.warning("Please fill in all selection boxes!", icon="⚠️")
+        return False
+    return True
+
+
+st.markdown(
+    """
+    <h1 style="
+        font-size: 42px;
+        font-weight: 900;
+        background: linear-gradient(90deg, #00FFF0, #FF2DA3, #FF6EC7);
+        -webkit-background-clip: text;
+        -webkit-text-fill-color: transparent;
+        background-clip: text;
+        color: transparent;
+        text-align: center;
+        margin-bottom: 0px;
+        font-family: 'Arial Black', sans-serif;
+        text-shadow: 2px 2px 4px rgba(0, 0, 0, 0.35);
+    ">
+    Full Health Assessment
+    </h1>
+    """,
+    unsafe_allow_html=True
+)
+st.markdown(
+    """
+    <div style="
+        text-align: center;
+        font-size: 18px;
+        font-weight: 400;
+        color: #3A3B7A;
+        margin-bottom: 30px;
+        font-style: italic;
+        line-height: 1.6;
+    ">
+        <div>Enter your values once and get every BioPredict risk score together.</div>
+    </div>
+    """,
+    unsafe_allow_html=True
+)
+
+st.caption("This tool is for educational purposes only and does not provide a medical diagnosis. Results should be interpreted in conjunction with clinical evaluation.")
+
+selected_labels = st.multiselect(
+    "Assessments to run",
+    options=list(DISEASE_LABELS.values()),
+    default=list(DISEASE_LABELS.values())
+)
+selected_diseases = [LABEL_TO_DISEASE[label] for label in selected_labels]
+
+st.markdown("### Shared Measurements")
+col1, col2, col3 = st.columns(3)
+with col1:
+    age = st.slider("Age", 1, 120, 50)
+    bmi = st.slider("BMI (Body Mass Index)", 10.0, 70.0, 25.0)
+with col2:
+    systolic_bp = st.slider("Systolic Blood Pressure (mmHg)", 80, 200, 120)
+    diastolic_bp = st.slider("Diastolic Blood Pressure (mmHg)", 40, 120, 80)
+with col3:
+    cholesterol = st.slider("Total Cholesterol (mg/dL)", 100, 400, 200)
+    glucose = st.slider("Fasting Glucose (mg/dL)", 40, 300, 100)
+
+selections = []
+
+if "heart" in selected_diseases:
+    with st.expander("Heart Disease", expanded=False):
+        col1, col2 = st.columns(2)
+        with col1:
+            chest_pain = st.selectbox("Chest Pain Type", ["Select", 'ATA', 'NAP', 'ASY', 'TA'])
+            resting_ecg = st.selectbox("Resting ECG Result", ["Select", 'Normal', 'ST', 'LVH'])
+            st_slope = st.selectbox("ST Slope", ["Select", 'Up', 'Flat', 'Down'])
+        with col2:
+            exercise_angina = st.selectbox("Exercise-Induced Angina", ["Select", 'N', 'Y'])
+            max_hr = st.slider("Maximum Heart Rate (bpm)", 60, 220, 150)
+            oldpeak = st.slider("ST Depression (mm)", 0.0, 10.0, 0.0, 0.1)
+    selections += [chest_pain, resting_ecg, st_slope, exercise_angina]
+
+if "diabetes" in selected_diseases:
+    with st.expander("Diabetes", expanded=False):
+        col1, col2 = st.columns(2)
+        with col1:
+            pregnancies = st.slider("Pregnancies", 0, 20, 0)
+            skin_thickness = st.slider("Skin Thickness (mm)", 0, 100, 20)
+        with col2:
+            insulin = st.slider("Insulin (µU/mL)", 0, 900, 80)
+            dpf = st.slider("Diabetes Pedigree Function (Family History)", 0.0, 2.5, 0.5, step=0.01)
+
+if "parkinson" in selected_diseases:
+    with st.expander("Parkinson's Voice Measurements", expanded=False):
+        col1, col2 = st.columns(2)
+        voice = {}
+        for i, (feature, (min_val, max_val)) in enumerate(PARKINSON_RANGES.items()):
+            step = (max_val - min_val) / 1000
+            column = col1 if i % 2 == 0 else col2
+            voice[feature] = column.slider(feature, min_val, max_val, (min_val + max_val) / 2, step=step)
+
+if "thyroid" in selected_diseases:
+    with st.expander("Thyroid Clinical Findings", expanded=False):
+        col1, col2 = st.columns(2)
+        with col1:
+            tumor = st.selectbox("Tumor Status", [
+                "Select",
+                "tumor that is 1 cm or smaller",
+                "tumor larger than 1 cm but not larger than 2 cm",
+                "tumor larger than 2 cm but not larger than 4 cm",
+                "tumor larger than 4 cm",
+                "tumor that has grown outside the thyroid",
+                "tumor that has invaded nearby structures"
+            ])
+            physical_exam = st.selectbox("Physical Examination", ["Select", "Normal", "Abnormal"])
+            adenopathy = st.selectbox("Adenopathy", [
+                "Select",
+                "No Lympth Adenopathy",
+                "Left Side Body Adenopathy",
+                "Right Side Body Adenopathy",
+                "Extensive and Widespread"
+            ])
+            pathology = st.selectbox("Type of Thyroid Cancer", ["Select", "Papillary", "Follicular", "Other"])
+            focality = st.selectbox("Focality (Number of Tumor Foci)", ["Select", "Unifocal", "Multifocal"])
+        with col2:
+            risk = st.selectbox("Risk Status", ["Select", "Low", "Intermediate", "High"])
+            thyroid_function = st.selectbox("Thyroid Function", ["Select", "Normal", "Hypo", "Hyper"])
+            nodes = st.selectbox("Lymph Node Status", [
+                "Select",
+                "No evidence of regional lymph node metastasis",
+                "Regional lymph node metastasis in the central neck",
+                "Regional lymph node metastasis in the lateral neck"
+            ])
+            stage = st.selectbox("Clinical Stage", ["Select", "First-Stage", "Second-Stage", "Third-Stage"])
+            response = st.selectbox("Treatment Response", [
+                "Select", "Excellent", "Indeterminate", "Biochemical Incomplete", "Structural Incomplete"
+            ])
+    selections += [tumor, physical_exam, adenopathy, pathology, focality, risk, thyroid_function, nodes, stage, response]
+
+if "alzheimer" in selected_diseases:
+    with st.expander("Alzheimer's Lifestyle and Cognition", expanded=False):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            ethnicity = st.selectbox("Ethnicity", ["Select"] + list(ETHNICITY_TO_CODE))
+            education = st.selectbox("Education Level", ["Select"] + list(EDU_TO_CODE))
+            smoking = st.radio("Smoking", options=list(YESNO_TO_CODE), horizontal=True, index=0)
+            cvd = st.radio("CardiovascularDisease", options=list(YESNO_TO_CODE), horizontal=True, index=0)
+            depression = st.radio("Depression", options=list(YESNO_TO_CODE), horizontal=True, index=0)
+        with col2:
+            alcohol = st.number_input("AlcoholConsumption", min_value=0.0, max_value=25.0, value=8.0, step=0.1)
+            activity = st.number_input("PhysicalActivity", min_value=0.0, max_value=12.0, value=7.0, step=0.1)
+            diet = st.number_input("DietQuality", min_value=0.0, max_value=10.0, value=5.0, step=0.1)
+            chol_ldl = st.number_input("CholesterolLDL", min_value=40, max_value=250, value=130, step=1)
+            chol_hdl = st.number_input("CholesterolHDL", min_value=20, max_value=120, value=50, step=1)
+            chol_tg = st.number_input("CholesterolTriglycerides", min_value=50, max_value=500, value=150, step=1)
+        with col3:
+            mmse = st.number_input("MMSE", min_value=0.0, max_value=30.0, value=26.0, step=0.5)
+            func = st.number_input("FunctionalAssessment", min_value=0.0, max_value=10.0, value=6.0, step=0.1)
+            adl = st.number_input("ADL", min_value=0.0, max_value=10.0, value=7.0, step=0.1)
+            memory = st.radio("MemoryComplaints", options=list(YESNO_TO_CODE), horizontal=True, index=0)
+            behavior = st.radio("BehavioralProblems", options=list(YESNO_TO_CODE), horizontal=True, index=0)
+    selections += [ethnicity, education]
+
+st.markdown(
+    """
+    <style>
+    div.stButton > button {
+        background-color: #4CAF50;
+        color: white;
+        height: 40px;
+        width: 150px;
+        border-radius: 10px;
+        border: none;
+        font-size: 16px;
+        font-weight: 600;
+        cursor: pointer;
+        display: block;
+        margin: 0 auto;
+    }
+    </style>
+    """, unsafe_allow_html=True
+)
+
+if st.button("Predict"):
+    if validate_inputs(selected_diseases, selections):
+        try:
+            if not all(warmup.is_ready(disease) for disease in selected_diseases):
+                with st.spinner("Loading the models for the first time since the app started..."):
+                    for disease in selected_diseases:
+                        warmup.wait(disease)
+
+            # Heavy imports and the models wait for the first prediction so
+            # the page's form paints without them.
+            import pandas as pd
+            import combined_scoring
+
+            timer = StageTimer()
+
+            # One row per model, in the same columns as its training CSV, so
+            # every model goes through batch_scoring's validation and encoding.
+            records = {}
+            if "heart" in selected_diseases:
+                records["heart"] = {
+                    'Age': age, 'Sex': user_gender, 'ChestPainType': chest_pain,
+                    'RestingBP': systolic_bp, 'Cholesterol': cholesterol,
+                    'FastingBS': int(glucose > 120), 'RestingECG': resting_ecg,
+                    'MaxHR': max_hr, 'ExerciseAngina': exercise_angina,
+                    'Oldpeak': oldpeak, 'ST_Slope': st_slope
+                }
+            if "diabetes" in selected_diseases:
+                records["diabetes"] = {
+                    'Pregnancies': pregnancies, 'Glucose': glucose, 'BloodPressure': diastolic_bp,
+                    'SkinThickness': skin_thickness, 'Insulin': insulin, 'BMI': bmi,
+                    'DiabetesPedigreeFunction': dpf, 'Age': age
+                }
+            if "parkinson" in selected_diseases:
+                records["parkinson"] = dict(voice)
+            if "thyroid" in selected_diseases:
+                records["thyroid"] = {
+                    'Age': age, 'Gender': user_gender, 'Thyroid Function': thyroid_function,
+                    'Physical Examination': physical_exam, 'Adenopathy': adenopathy,
+                    'Types of Thyroid Cancer (Pathology)': pathology, 'Focality': focality,
+                    'Risk': risk, 'Tumor': tumor, 'Lymph Nodes': nodes, 'Stage': stage,
+                    'Treatment Response': response
+                }
+            if "alzheimer" in selected_diseases:
+                records["alzheimer"] = {
+                    'Age': age, 'Gender': 0 if user_gender == "Female" else 1,
+                    'Ethnicity': ETHNICITY_TO_CODE[ethnicity], 'EducationLevel': EDU_TO_CODE[education],
+                    'BMI': bmi, 'Smoking': YESNO_TO_CODE[smoking], 'AlcoholConsumption': alcohol,
+                    'PhysicalActivity': activity, 'DietQuality': diet,
+                    'CardiovascularDisease': YESNO_TO_CODE[cvd], 'Depression': YESNO_TO_CODE[depression],
+                    'SystolicBP': systolic_bp, 'DiastolicBP': diastolic_bp,
+                    'CholesterolTotal': cholesterol, 'CholesterolLDL': chol_ldl,
+                    'CholesterolHDL': chol_hdl, 'CholesterolTriglycerides': chol_tg,
+                    'MMSE': mmse, 'FunctionalAssessment': func,
+                    'MemoryComplaints': YESNO_TO_CODE[memory], 'BehavioralProblems': YESNO_TO_CODE[behavior],
+                    'ADL': adl
+                }
+            timer.lap("encode")
+
+            results, wall_ms = combined_scoring.score_all(records)
+            timer.lap("predict")
+
+            rows = []
+            for disease, result in results.items():
+                if "error" in result:
+                    rows.append({"Assessment": DISEASE_LABELS[disease], "Result": f"❗ {result['error']}",
+                                 "Risk (%)": None, "Time (ms)": None})
+                    continue
+                rows.append({
+                    "Assessment": DISEASE_LABELS[disease],
+                    "Result": "⚠️ At risk" if result["prediction"] == 1 else "✅ Not at risk",
+                    "Risk (%)": round(result["probability"] * 100, 2),
+                    "Time (ms)": round(result["elapsed_ms"], 2),
+                })
+
+            name_text = user_name if user_name else "This person"
+            flagged = [row["Assessment"] for row in rows if row["Result"] == "⚠️ At risk"]
+            if flagged:
+                st.markdown(
+                    f"<h3 style='text-align: center; color: red; font-size: 24px;'>{name_text} is at <b>risk</b> of: {', '.join(flagged)}.</h3>",
+                    unsafe_allow_html=True
+                )
+            else:
+                st.balloons()
+                st.markdown(
+                    f"<h3 style='text-align: center; color: green; font-size: 24px;'>{name_text} is <b>NOT</b> at <b>risk</b> in any assessment.</h3>",
+                    unsafe_allow_html=True
+                )
+
+            results_df = pd.DataFrame(rows)
+            st.dataframe(results_df, use_container_width=True, hide_index=True)
+
+            summed_ms = sum(result.get("elapsed_ms", 0) for result in results.values())
+            st.caption(f"All {len(results)} models ran together in {wall_ms:.1f} ms (one after another: {summed_ms:.1f} ms).")
+
+            st.download_button(
+                "Download results (CSV)",
+                data=results_df.to_csv(index=False).encode("utf-8"),
+                file_name=f"{(user_name or 'patient').replace(' ', '_')}_full_assessment.csv",
+                mime="text/csv"
+            )
+            timer.lap("render")
+            render_diagnostics(timer)
+
+        except Exception as e:
+            st.error(f"❌ An error occurred: {e}")
@@ -1,21 +1,11 @@
-import base64
-from datetime import datetime
 import streamlit as st
-import pandas as pd
-import numpy as np
-import joblib
-import time
-import altair as alt
 from textwrap import dedent
-
-@st.cache_resource
-def load_diabetes_model():
-    model = joblib.load("diabetes_classifier.pkl")
-    scaler = joblib.load("diabetes_scaler.pkl")
-    feature_names = joblib.load("feature_names.pkl")
-    return model, scaler, feature_names
-
-model, scaler, feature_names = load_diabetes_model()
+from batch_upload import render_batch_upload
+from diagnostics import StageTimer, render_diagnostics
+from report_download import render_report_download
+import report_store
+import report_templates
+import warmup
 
 user_name = st.session_state.get("user_name", "").strip()
 user_gender = st.session_state.get("user_gender", "Select")
@@ -78,6 +68,8 @@ st.markdown(
 
 st.caption("This tool is for educational purposes only and does not provide a medical diagnosis. Results should be interpreted in conjunction with clinical evaluation.")
 
+render_batch_upload("diabetes", "Diabetes", "diabetes.csv")
+
 
 st.markdown("<h2 style='font-weight:600; font-size:23px;'>Personal Informations</h2>", unsafe_allow_html=True)
 
@@ -243,9 +235,18 @@ if st.button("Predict"):
     }
     if validate_inputs(diabetes_inputs,user_name,sex):
         try:
-            with st.spinner("Making prediction..."):
-                time.sleep(2)  
-            
+            if not warmup.is_ready("diabetes"):
+                with st.spinner("Loading the model for the first time since the app started..."):
+                    warmup.wait("diabetes")
+
+            # Heavy imports and the model wait for the first prediction so the
+            # page's form paints without them.
+            import pandas as pd
+            import prediction_cache
+            import result_charts
+
+            timer = StageTimer()
+
             input_data = pd.DataFrame([[
                 pregnancies,
                 glucose,
@@ -258,13 +259,12 @@ if st.button("Predict"):
             ]], columns=[
                 'Pregnancies', 'Glucose', 'BloodPressure', 'SkinThickness', 'Insulin', 'BMI', 'DiabetesPedigreeFunction', 'Age'
             ])
+            timer.lap("encode")
 
-            features_to_scale = ['Pregnancies', 'Glucose', 'BloodPressure', 'SkinThickness', 'Insulin', 'BMI', 'DiabetesPedigreeFunction', 'Age']
-            input_data[features_to_scale] = scaler.transform(input_data[features_to_scale])
-
-            prediction = model.predict(input_data)
-            probabilities = model.predict_proba(input_data)
-            risk_prob = probabilities[0][1]
+            # Raw values: the scaler is folded into the compiled kernel.
+            prediction, probabilities = prediction_cache.predict("diabetes", input_data)
+            risk_prob = probabilities[0]
+            timer.lap("predict")
 
             if prediction[0] == 0:
                 st.balloons()
@@ -330,47 +330,9 @@ if st.button("Predict"):
             }
             raw_df["Normal Range"] = raw_df["Feature"].map(normal_ranges)
 
-            facet_base = alt.Chart(raw_df).mark_bar().encode(
-                y=alt.Y('Value:Q', title='Değer'),
-                x=alt.X('Feature:N', axis=None),
-                color=alt.Color('Color:N', scale=None),
-                tooltip=['Feature', 'Value', 'Normal Range']
-            ).properties(
-                width=120,
-                height=300
-            )
-
-            text_labels = alt.Chart(raw_df).mark_text(
-                align='center',
-                baseline='bottom',
-                dy=-5,
-                fontSize=13,
-                color='black'
-            ).encode(
-                x='Feature:N',
-                y='Value:Q',
-                text=alt.Text('Value:Q', format='.1f')
-            ).properties(width=120)
-
-            range_labels = alt.Chart(raw_df).mark_text(
-                align='center',
-                baseline='bottom',
-                dy=-25,
-                fontSize=11,
-                color='#555'
-            ).encode(
-                x='Feature:N',
-                y='Value:Q',
-                text='Normal Range:N'
-            ).properties(width=120)
-
-            final_chart = (facet_base + text_labels + range_labels).facet(
-                column=alt.Column('Feature:N', title=None, header=alt.Header(labelFontWeight='bold', labelFontSize=14))
-            )
-
-        
-            st.altair_chart(final_chart, use_container_width=False)
+            result_charts.show("diabetes", raw_df, use_container_width=False)
             st.markdown("</div>", unsafe_allow_html=True)
+            timer.lap("render")
 
             advice_list = []
 
@@ -432,140 +394,32 @@ if st.button("Predict"):
             if not advice_list:
                 advice_list.append("All your health indicators are normal. Keep maintaining this level.")
 
-            advice_html = "".join(f"<li>{item}</li>" for item in advice_list)
-            
-            report_html = f"""
-            <html>
-            <head>
-            <style>
-            body {{
-                font-family: Arial, sans-serif;
-                line-height: 1.6;
-                padding: 20px;
-                display: flex;
-                flex-direction: column;
-                justify-content: center;
-                align-items: center;
-                min-height: 100vh;
-                text-align: center;
-            }}
-            h2 {{
-                color: #2E86C1;
-            }}
-            h3 {{
-                color: {'green' if prediction[0] == 0 else 'red'};
-            }}
-            .section {{
-                    margin-bottom: 20px;
-                    width: 100%;
-                    max-width: 600px;
-                }}
-            .section ul {{
-                    list-style-position: inside;  
-                    padding: 0;
-                    margin: 0 auto;
-                    display: inline-block;    
-                    text-align: left;         
-            }}
-            .success {{ color: green; }}
-            .warning {{ color: orange; }}
-            .error {{ color: red; }}
-            ul {{
-                list-style-type: none;
-                padding: 0;
-                text-align: left;
-            }}
-            li {{
-                margin-bottom: 10px;
-            }}
-            </style>
-            </head>
-            <body>
-                <h2>📝 Diabetes Report 📝</h2>
-            <h3>{'✅ No Diabetes ✅' if prediction[0] == 0 else '⚠️ Diabetes Present ⚠️'}</h3>
-
-            <div class="section">
-                {f'<p style="margin:0; padding:0;"><b>Name:</b> {user_name}</p>' if user_name else ""}
-                <b>Age:</b> {Age} <br>
-                <b>Gender:</b> {sex}
-            </div>
-            <h3>Health Status</h3>
-
-
-            <ul>                    
-                <li><span class="{glucose_class}">{glucose_comment}</span></li>
-                <li><span class="{bp_class}">{bp_comment}</span></li>
-                <li><span class="{bmi_class}">{bmi_comment}</span></li>
-                <li><span class="{insulin_class}">{insulin_comment}</span></li>
-            </ul>
-            
-            <div class="section">
-            <h3 style="margin:0; padding:0;">Personalized Recommendations for {user_name}</h3>
-                    <ul>
-             {advice_html}
-                    </ul>
-            </div>
-
-            <h3>General Health Recommendations</h3>
-            <ul>
-                <li>Healthy eating and regular exercise are very important.</li>
-                <li>Limit smoking and alcohol consumption.</li>
-                <li>Monitor your blood sugar levels regularly.</li>
-                <li>Do not skip your annual health check-ups.</li>
-                <li>Maintain a healthy weight to reduce diabetes risk.</li>
-                <li>Manage stress through relaxation techniques or mindfulness.</li>
-            </ul>
-            </body>
-            </html>
-
-            """
-          
-
-            b64_report = base64.b64encode(report_html.encode()).decode()
-            href = f'data:text/html;base64,{b64_report}'
-            disease_type = "Diabetes"  
-            if "all_reports" not in st.session_state:
-                st.session_state["all_reports"] = {}
-
-            if disease_type not in st.session_state["all_reports"]:
-                st.session_state["all_reports"][disease_type] = []
-
-            st.session_state["all_reports"][disease_type].append({
-                "user_name": user_name or "Unknown User",
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "html": report_html
-            })
+            result = report_templates.ReportResult(
+                disease="diabetes",
+                prediction=prediction[0],
+                probability=risk_prob,
+                statuses=[
+                    (glucose_class, glucose_comment),
+                    (bp_class, bp_comment),
+                    (bmi_class, bmi_comment),
+                    (insulin_class, insulin_comment),
+                ],
+                advice=advice_list,
+                user_name=user_name,
+                age=Age,
+                gender=sex,
+            )
+            report_id = report_store.store.add(
+                st.session_state.setdefault("report_session", report_store.new_session_id()),
+                user_name,
+                result,
+            )
 
             safe_user_name = user_name.lower().replace(" ", "_") if user_name else "user"
             file_name = f"{safe_user_name}_diabetes_report.html"
-
-            st.markdown(f"""
-                <div style="text-align: center; margin-top: 40px; animation: fadeIn 3s;">
-                    <a href="{href}" download="{file_name}" style="
-                        background: linear-gradient(90deg, #4C6EF5, #15AABF);
-                        color: white;
-                        padding: 14px 30px;
-                        font-size: 18px;
-                        font-weight: bold;
-                        border-radius: 12px;
-                        text-decoration: none;
-                        box-shadow: 3px 3px 10px rgba(0,0,0,0.2);
-                        transition: 0.3s;
-                        display: inline-block;
-                    ">
-                    Diabetes Report 📥
-                    </a>
-                </div>
-            """, unsafe_allow_html=True)
-
-            st.markdown("""
-                <style>
-                @keyframes fadeIn {
-                    from { opacity: 0; transform: translateY(10px); }
-                    to { opacity: 1; transform: translateY(0); }
-                }
-                </style>
-            """, unsafe_allow_html=True)
+            render_report_download(report_id, file_name, "Diabetes Report 📥")
+            timer.lap("report")
+            render_diagnostics(timer)
 
         except Exception as e:
             st.error(f"❌ An error occurred: {e}")
@@ -1,25 +1,13 @@
-from datetime import datetime
 from textwrap import dedent
 import streamlit as st
-import pandas as pd
-import joblib
-from vega_datasets import data
-import altair as alt
-import time
-import base64
+from batch_upload import render_batch_upload
+from diagnostics import StageTimer, render_diagnostics
+from report_download import render_report_download
+import report_store
+import report_templates
+import warmup
 
 
-
-model_data = joblib.load("heart_model.pkl")
-
-clf = model_data['model']
-scaler = model_data['scaler']
-mms = model_data['mms']
-le_dict = model_data['le_dict']
-feature_names = model_data['feature_names']
-scaler_features = model_data['scaler_features']
-mms_features = model_data['mms_features']
-
 def validate_inputs(sex, chest_pain, fasting_bs, resting_ecg, exercise_angina, st_slope, age, oldpeak):
     required_fields = [sex, chest_pain, fasting_bs, resting_ecg, exercise_angina, st_slope]
     
@@ -78,6 +66,8 @@ st.markdown(
 
 st.caption("This tool is for educational purposes only and does not provide a medical diagnosis. Results should be interpreted in conjunction with clinical evaluation.")
 
+render_batch_upload("heart", "Heart Disease", "heart.csv")
+
 
 user_name = st.session_state.get("user_name", "").strip()
 
@@ -229,27 +219,19 @@ def get_color(feature, value):
 if st.button("Predict"):
     if validate_inputs(sex, chest_pain, fasting_bs, resting_ecg, exercise_angina, st_slope, age, oldpeak):
         try:
-            with st.spinner("Making prediction..."):
-                time.sleep(2)
-
-            categorical_input = {
-                'Sex': sex,
-                'ChestPainType': chest_pain,
-                'RestingECG': resting_ecg,
-                'ExerciseAngina': exercise_angina,
-                'ST_Slope': st_slope
-            }
+            if not warmup.is_ready("heart"):
+                with st.spinner("Loading the model for the first time since the app started..."):
+                    warmup.wait("heart")
+
+            # Heavy imports and the model wait for the first prediction so the
+            # page's form paints without them.
+            import pandas as pd
+            import model_registry
+            import prediction_cache
+            import result_charts
 
-            encoded = {}
-            for col, val in categorical_input.items():
-                le = le_dict.get(col)
-                if le is None:
-                    st.error(f"Label encoder for {col} not found!")
-                    st.stop()
-                if val not in le.classes_:
-                    st.error(f"Unknown value for {col}: {val}")
-                    st.stop()
-                encoded[col] = le.transform([val])[0]
+            pipeline = model_registry.load("heart")['pipeline']
+            timer = StageTimer()
 
             try:
                 fasting_bs_val = int(fasting_bs)
@@ -258,28 +240,30 @@ if st.button("Predict"):
                 st.stop()
 
             input_dict = {
-                'Age': age,
-                'Sex': encoded['Sex'],
-                'ChestPainType': encoded['ChestPainType'],
-                'RestingBP': resting_bp,
-                'Cholesterol': cholesterol,
-                'FastingBS': fasting_bs_val,
-                'RestingECG': encoded['RestingECG'],
-                'MaxHR': max_hr,
-                'ExerciseAngina': encoded['ExerciseAngina'],
-                'Oldpeak': oldpeak,
-                'ST_Slope': encoded['ST_Slope']
+                'Age': [age],
+                'Sex': [sex],
+                'ChestPainType': [chest_pain],
+                'RestingBP': [resting_bp],
+                'Cholesterol': [cholesterol],
+                'FastingBS': [fasting_bs_val],
+                'RestingECG': [resting_ecg],
+                'MaxHR': [max_hr],
+                'ExerciseAngina': [exercise_angina],
+                'Oldpeak': [oldpeak],
+                'ST_Slope': [st_slope]
             }
 
-            input_data = pd.DataFrame([input_dict], columns=feature_names)
+            try:
+                input_data = pipeline.encode(input_dict)
+            except ValueError as e:
+                st.error(str(e))
+                st.stop()
+            timer.lap("encode")
 
-            input_data[scaler_features] = scaler.transform(input_data[scaler_features])
-                
-            input_data[mms_features] = mms.transform(input_data[mms_features])
-                
-            prediction = clf.predict(input_data)
-            probabilities = clf.predict_proba(input_data)
-            risk_prob = probabilities[0][1]  
+            # Both scalers are folded into the compiled pipeline.
+            prediction, probabilities = prediction_cache.predict("heart", input_data)
+            risk_prob = probabilities[0]
+            timer.lap("predict")
 
             if prediction[0] == 0:
                 st.balloons()
@@ -349,37 +333,8 @@ if st.button("Predict"):
             }
             max_y = max(limit[1] for limit in y_domains.values())
 
-            base_chart = alt.Chart(raw_df).mark_bar().encode(
-                x=alt.X('Feature', sort='-y'),
-                y=alt.Y('Value', scale=alt.Scale(domain=[0, max_y])),
-                color=alt.Color('Color:N', scale=None),
-                tooltip=['Feature', 'Value', 'Normal Range']
-            )
-
-            text = base_chart.mark_text(
-                align='center',
-                baseline='bottom',
-                dy=-5,
-                color='black'
-            ).encode(
-                text=alt.Text('Value', format='.1f')
-            )
-
-            normal_range_text = alt.Chart(raw_df).mark_text(
-                align='center',
-                baseline='top',
-                dy=10,
-                fontSize=11,
-                color='#555'
-            ).encode(
-                x='Feature:N',
-                y=alt.value(0),
-                text='Normal Range:N'
-            )
-
-            final_chart = base_chart + text + normal_range_text
-
-            st.altair_chart(final_chart, use_container_width=True)
+            result_charts.show("heart", raw_df, max_y=max_y)
+            timer.lap("render")
         
             advice_list = []
 
@@ -443,139 +398,32 @@ if st.button("Predict"):
             if not advice_list:
                 advice_list.append("👏 All your health indicators are normal! Keep maintaining this level.")
 
-            advice_html = "".join(f"<li>{item}</li>" for item in advice_list)
-
-            report_html = f"""
-            <html>
-            <head>
-            <style>
-            body {{
-                font-family: Arial, sans-serif;
-                line-height: 1.6;
-                padding: 20px;
-                display: flex;
-                flex-direction: column;
-                justify-content: center;
-                align-items: center;
-                min-height: 100vh;
-                text-align: center;
-            }}
-            h2 {{
-                    color: #2E86C1;
-            }}
-            h3 {{
-                    color: {'green' if prediction[0] == 0 else 'red'};
-            }}
-            .section {{
-                    margin-bottom: 20px;
-                    width: 100%;
-                    max-width: 600px;
-            }}
-            .section ul {{
-                    list-style-position: inside;  
-                    padding: 0;
-                    margin: 0 auto;
-                    display: inline-block;    
-                    text-align: left;         
-            }}
-            .success {{ color: green; }}
-            .warning {{ color: orange; }}
-            .error {{ color: red; }}
-            ul {{
-                    list-style-type: none;
-                    padding: 0;
-                    text-align: left;
-            }}
-            li {{
-                    margin-bottom: 10px;
-            }}
-            </style>
-            </head>
-            <body>
-            <h2>📝 Heart Health Report 📝</h2>
-            <h3>{'✅ No Heart Disease ✅' if prediction[0] == 0 else '⚠️ Heart Disease Detected ⚠️'}</h3>
-
-            <div class="section">
-                    {f'<p style="margin:0; padding:0;"><b>Ad:</b> {user_name}</p>' if user_name else ""}
-                    <b>Age:</b> {age} <br>
-                    <b>Gender:</b> {sex}
-            </div>
-
-            <h3>Health Status</h3>,
-            <ul>
-                <li><span class="{bp_class}">{bp_comment}</span></li>
-                <li><span class="{cholesterol_class}">{cholesterol_comment}</span></li>
-                <li><span class="{hr_class}">{hr_comment}</span></li>
-                <li><span class="{st_class}">{st_comment}</span></li>
-            </ul>
-
-           <div class="section">
-                <h3 style="margin:0; padding:0;">Personalized Recommendations for {user_name}</h3>
-                    <ul>
-             {advice_html}
-                    </ul>
-            </div>
-                <h3>General Health Recommendations</h3>
-             <ul>
-                <li>Maintaining a healthy diet and engaging in regular physical activity are crucial for heart health.</li>
-                <li>Avoid smoking and alcohol consumption.</li>
-                <li>Have regular medical check-ups.</li>
-                <li>Monitor your blood pressure and cholesterol levels consistently.</li>
-                <li>If you experience any symptoms or discomfort, seek medical attention without delay.</li>
-                <li>Ensure you get adequate sleep and manage stress effectively to reduce heart strain.</li>
-                <li>Maintain a healthy weight, as obesity is a significant risk factor for heart disease.</li>
-            </ul>
-
-            </body>
-            </html>
-            """
-            b64_report = base64.b64encode(report_html.encode()).decode()
-            href = f'data:text/html;base64,{b64_report}'
-            
-            disease_type = "Heart Disease"  
-            if "all_reports" not in st.session_state:
-                st.session_state["all_reports"] = {}
-
-            if disease_type not in st.session_state["all_reports"]:
-                st.session_state["all_reports"][disease_type] = []
-
-            st.session_state["all_reports"][disease_type].append({
-                "user_name": user_name or "Unknown User",
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "html": report_html
-            })
+            result = report_templates.ReportResult(
+                disease="heart",
+                prediction=prediction[0],
+                probability=risk_prob,
+                statuses=[
+                    (bp_class, bp_comment),
+                    (cholesterol_class, cholesterol_comment),
+                    (hr_class, hr_comment),
+                    (st_class, st_comment),
+                ],
+                advice=advice_list,
+                user_name=user_name,
+                age=age,
+                gender=sex,
+            )
+            report_id = report_store.store.add(
+                st.session_state.setdefault("report_session", report_store.new_session_id()),
+                user_name,
+                result,
+            )
 
             safe_user_name = user_name.lower().replace(" ", "_") if user_name else "user"
             file_name = f"{safe_user_name}_heart_health_report.html"
-
-
-            st.markdown(f"""
-                <div style="text-align: center; margin-top: 40px; animation: fadeIn 3s;">
-                    <a href="{href}" download="{file_name}" style="
-                        background: linear-gradient(90deg, #4C6EF5, #15AABF);
-                        color: white;
-                        padding: 14px 30px;
-                        font-size: 18px;
-                        font-weight: bold;
-                        border-radius: 12px;
-                        text-decoration: none;
-                        box-shadow: 3px 3px 10px rgba(0,0,0,0.2);
-                        transition: 0.3s;
-                        display: inline-block;
-                    ">
-                    Heart Disease Report 📥
-                    </a>
-                </div>
-            """, unsafe_allow_html=True)
-
-            st.markdown("""
-                <style>
-                @keyframes fadeIn {
-                    from { opacity: 0; transform: translateY(10px); }
-                    to { opacity: 1; transform: translateY(0); }
-                }
-                </style>
-            """, unsafe_allow_html=True)
+            render_report_download(report_id, file_name, "Heart Disease Report 📥")
+            timer.lap("report")
+            render_diagnostics(timer)
 
         except Exception as e:
             st.error(f"❌ An error occurred: {e}")
@@ -1,20 +1,11 @@
-import base64
-from datetime import datetime
 from textwrap import dedent
 import streamlit as st
-import pandas as pd
-import joblib
-import time
-import altair as alt
-
-@st.cache_resource
-def load_parkinson_model():
-    model = joblib.load("parkinson_model.pkl")
-    scaler = joblib.load("parkinson_scaler.pkl")
-    feature_names = joblib.load("parkinson_feature_names.pkl")
-    return model, scaler, feature_names
-
-model, scaler, feature_names = load_parkinson_model()
+from batch_upload import render_batch_upload
+from diagnostics import StageTimer, render_diagnostics
+from report_download import render_report_download
+import report_store
+import report_templates
+import warmup
 
 user_name = st.session_state.get("user_name", "").strip()
 
@@ -83,6 +74,8 @@ st.markdown(
 
 st.caption("This tool is for educational purposes only and does not provide a medical diagnosis. Results should be interpreted in conjunction with clinical evaluation.")
 
+render_batch_upload("parkinson", "Parkinson's", "parkinsons.data")
+
 with st.expander("", expanded=True):
     has_name = bool(user_name and str(user_name).strip())
     has_gender = user_gender not in ["Select", "", None]
@@ -235,16 +228,29 @@ if st.button("Predict"):
 
     if validate_inputs(parkinsons_inputs,user_name,sex):
         try:
-            with st.spinner("Making prediction..."):
-                time.sleep(2)
+            if not warmup.is_ready("parkinson"):
+                with st.spinner("Loading the model for the first time since the app started..."):
+                    warmup.wait("parkinson")
+
+            # Heavy imports and the model wait for the first prediction so the
+            # page's form paints without them.
+            import pandas as pd
+            import model_registry
+            import prediction_cache
+            import result_charts
 
+            scaler = model_registry.load("parkinson")["scaler"]
+            timer = StageTimer()
 
             input_data = pd.DataFrame([inputs], columns=feature_names)
+            timer.lap("encode")
             input_data[feature_names] = scaler.transform(input_data[feature_names])
+            timer.lap("scale")
 
-            prediction = model.predict(input_data)[0]
-            probabilities = model.predict_proba(input_data)
-            risk_prob = probabilities[0][1]
+            predictions, probabilities = prediction_cache.predict("parkinson", input_data)
+            prediction = predictions[0]
+            risk_prob = probabilities[0]
+            timer.lap("predict")
 
             if prediction == 0:
                 st.balloons()
@@ -396,40 +402,8 @@ if st.button("Predict"):
                 max_y = group_df['Value'].max() * 1.1  
                 group_df['Value'] = group_df['Value'].clip(lower=min_y, upper=max_y)    
 
-                base = alt.Chart(group_df).mark_bar().encode(
-                    x=alt.X('Feature:N', axis=alt.Axis(labelAngle=-45)),
-                    y=alt.Y('Value:Q', scale=alt.Scale(domain=[min_y, max_y])),  
-                    color=alt.Color('Color:N', scale=None),
-                    tooltip=['Feature', 'Value', 'Normal Range']
-                ).properties(width=600, height=300)
-
-                text = alt.Chart(group_df).mark_text(
-                    align='center',
-                    baseline='bottom',
-                    dy=-5,
-                    fontSize=12,
-                    color='black'
-                ).encode(
-                    x='Feature:N',
-                    y='Value:Q',
-                    text=alt.Text('Value:Q', format='.4f')
-                )
-
-                range_text = alt.Chart(group_df).mark_text(
-                    align='center',
-                    baseline='bottom',
-                    dy=-25,
-                    fontSize=11,
-                    color='#555'
-                ).encode(
-                    x='Feature:N',
-                    y='Value:Q',
-                    text='Normal Range:N'
-                )
-
-                chart = (base + text + range_text)
-
-                st.altair_chart(chart, use_container_width=True)
+                result_charts.show("parkinson", group_df, min_y=min_y, max_y=max_y)
+            timer.lap("render")
     
             advice_list = []
 
@@ -485,142 +459,31 @@ if st.button("Predict"):
                 advice_list.append("👏 All indicators are normal. Congratulations!")
 
         
-            advice_html = "".join(f"<li>{item}</li>" for item in advice_list)
-            report_html = f"""
-            <html>
-            <head>
-            <style>
-            body {{
-                font-family: Arial, sans-serif;
-                line-height: 1.6;
-                padding: 20px;
-                display: flex;
-                flex-direction: column;
-                justify-content: center;
-                align-items: center;
-                min-height: 100vh;
-                text-align: center;
-            }}
-            h2 {{
-                color: #2E86C1;
-            }}
-            h3 {{
-                color: {'green' if prediction == 0 else 'red'};
-                font-size: 20px;
-                margin-bottom: 20px;
-            }}
-            .section {{
-                    margin-bottom: 20px;
-                    width: 100%;
-                    max-width: 600px;
-                }}
-            .section ul {{
-                    list-style-position: inside;  
-                    padding: 0;
-                    margin: 0 auto;
-                    display: inline-block;    
-                    text-align: left;         
-            }}
-            .success {{ color: green; }}
-            .warning {{ color: orange; }}
-            .error {{ color: red; }}
-            ul {{
-                list-style-type: none;
-                padding: 0;
-                text-align: left;
-            }}
-            li {{
-                margin-bottom: 10px;
-            }}
-            </style>
-            </head>
-            <body>
-            <h2>📝 Parkinson Report 📝</h2>
-            <h3>{'✅ No Parkinson Disease Detected ✅' if prediction == 0 else '⚠️ Parkinson Disease Detected ⚠️'}</h3>
-
-
-            <div class="section">
-            {f'<p style="margin:0; padding:0;"><b>Ad:</b> {user_name}</p>' if user_name else ""}
-            {f'<p style="margin:0; padding:0;"><b>Cinsiyet:</b> {sex}</p>' if sex else ""}
-            </div>
-
-                            <h3>Health Status</h3>
-
-            <ul>                 
-                <li><span class="{mdpv_class}">{mdvp_comment}</span></li>   
-                <li><span class="{mdvp2_class}">{mdvp2_comment}</span></li>
-                <li><span class="{shimmer_class}">{shimmer_comment}</span></li>
-            </ul>
-            
-            <div class="section">
-                <h3 style="margin:0; padding:0;">Personalized Recommendations for {user_name}</h3>
-                    <ul>
-             {advice_html}
-                    </ul>
-            </div>
-
-            <h3>General Health Recommendations</h3>
-            <ul>
-                <li>Do not neglect regular neurological check-ups.</li>
-                <li>Stress management and a healthy lifestyle can reduce the risk of Parkinson's.</li>
-                <li>Participation in regular exercise and social activities is important.</li>
-                <li>Maintain a balanced diet rich in antioxidants and omega-3 fatty acids.</li>
-                <li>Ensure quality sleep to support brain health and overall well-being.</li>
-                <li>Avoid exposure to environmental toxins and harmful chemicals when possible.</li>
-                <li>Engage in cognitive activities such as reading, puzzles, or learning new skills to keep your mind active.</li>
-            </ul>
-
-            </body>
-            </html>
-            """
-            
-            b64_report = base64.b64encode(report_html.encode()).decode()
-            href = f'data:text/html;base64,{b64_report}'
-
-            disease_type = "Parkinson"  
-
-            if "all_reports" not in st.session_state:
-                st.session_state["all_reports"] = {}
-
-            if disease_type not in st.session_state["all_reports"]:
-                st.session_state["all_reports"][disease_type] = []
-
-            st.session_state["all_reports"][disease_type].append({
-                "user_name": user_name or "Bilinmeyen",
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "html": report_html
-            })
+            result = report_templates.ReportResult(
+                disease="parkinson",
+                prediction=prediction,
+                probability=risk_prob,
+                statuses=[
+                    (mdpv_class, mdvp_comment),
+                    (mdvp2_class, mdvp2_comment),
+                    (shimmer_class, shimmer_comment),
+                ],
+                advice=advice_list,
+                user_name=user_name,
+                gender=sex,
+            )
+            report_id = report_store.store.add(
+                st.session_state.setdefault("report_session", report_store.new_session_id()),
+                user_name,
+                result,
+            )
+
             safe_user_name = user_name.lower().replace(" ", "_") if user_name else "user"
             file_name = f"{safe_user_name}_parkinsons_report.html"
+            render_report_download(report_id, file_name, "Parkinson’s Report 📥")
+            timer.lap("report")
+            render_diagnostics(timer)
 
-            st.markdown(f"""
-                <div style="text-align: center; margin-top: 40px; animation: fadeIn 3s;">
-                    <a href="{href}" download="{file_name}" style="
-                        background: linear-gradient(90deg, #4C6EF5, #15AABF);
-                        color: white;
-                        padding: 14px 30px;
-                        font-size: 18px;
-                        font-weight: bold;
-                        border-radius: 12px;
-                        text-decoration: none;
-                        box-shadow: 3px 3px 10px rgba(0,0,0,0.2);
-                        transition: 0.3s;
-                        display: inline-block;
-                    ">
-                    Parkinson’s Report 📥
-                    </a>
-                </div>
-                """, unsafe_allow_html=True)
-
-            st.markdown("""
-                <style>
-                @keyframes fadeIn {
-                    from { opacity: 0; transform: translateY(10px); }
-                    to { opacity: 1; transform: translateY(0); }
-                }
-                </style>
-                """, unsafe_allow_html=True)
-            
         except Exception as e:
             st.error(f"An error occured: {e}")
 
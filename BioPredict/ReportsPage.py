@@ -1,5 +1,8 @@
 import streamlit as st
-import base64
+import report_export
+import report_store
+
+PAGE_SIZE = report_store.DEFAULT_PAGE_SIZE
 
 st.markdown("""
     <style>
@@ -17,20 +20,6 @@ st.markdown("""
         color: #222;
         margin-bottom: 8px;
     }
-    .download-link {
-        margin-top: 12px;
-        display: inline-block;
-        padding: 8px 14px;
-        background-color: #fbc02d;
-        color: white;
-        border-radius: 6px;
-        text-decoration: none;
-        font-weight: 500;
-        transition: background-color 0.3s;
-    }
-    .download-link:hover {
-        background-color: #fef0ad;
-    }
     </style>
 """, unsafe_allow_html=True)
 st.markdown("""
@@ -49,26 +38,118 @@ st.markdown("""
 
 
 
-if "all_reports" in st.session_state and st.session_state["all_reports"]:
-    report_types = list(st.session_state["all_reports"].keys())
+user_name = st.session_state.get("user_name", "").strip()
+session_id = st.session_state.get("report_session")
+# Only this browser session's reports: a typed-in name proves nothing.
+report_types = report_store.store.disease_types(session_id) if session_id else []
+
+if report_types:
     selected_type = st.selectbox("🔍 Choose Report Type", report_types)
 
-    selected_reports = st.session_state["all_reports"][selected_type]
+    with st.expander("🔎 Search Reports", expanded=False):
+        query = st.text_input("Words in the name, health status or recommendations", key="reports_query")
+        risk = st.slider("Risk (%)", 0, 100, (0, 100), key="reports_risk")
+        dates = st.date_input("Saved between", value=(), key="reports_dates")
+    filters = {
+        "query": query,
+        "min_probability": risk[0] / 100 if risk[0] > 0 else None,
+        "max_probability": risk[1] / 100 if risk[1] < 100 else None,
+        "since": dates[0] if len(dates) > 0 else None,
+        "until": dates[1] if len(dates) > 1 else None,
+    }
+
+    # Read from per-day and per-week totals kept as reports are saved, so
+    # the chart costs one row per bucket however long the history.
+    if st.toggle("📈 Risk Over Time", key="reports_timeline"):
+        import altair as alt
+        import pandas as pd
+
+        granularity = st.radio("Group by", ["week", "day"], horizontal=True, key="reports_timeline_granularity",
+                               format_func=lambda value: {"day": "Day", "week": "Week"}[value])
+        timeline = pd.DataFrame(
+            [dict(row) for row in report_store.store.timeline(session_id, granularity=granularity)],
+            columns=["disease_type", "bucket", "reports", "positives", "probability_mean",
+                     "probability_min", "probability_max"],
+        )
+        if timeline.empty:
+            st.info("No risk scores have been saved yet.")
+        else:
+            timeline["bucket"] = pd.to_datetime(timeline["bucket"])
+            for column in ("probability_mean", "probability_min", "probability_max"):
+                timeline[column] *= 100
+            x = alt.X("bucket:T", title="Week of" if granularity == "week" else "Day")
+            color = alt.Color("disease_type:N", title="Report Type")
+            band = alt.Chart(timeline).mark_area(opacity=0.15).encode(
+                x=x, y="probability_min:Q", y2="probability_max:Q", color=color,
+            )
+            line = alt.Chart(timeline).mark_line(point=True).encode(
+                x=x,
+                y=alt.Y("probability_mean:Q", title="Mean risk (%)", scale=alt.Scale(domain=[0, 100])),
+                color=color,
+                tooltip=[
+                    alt.Tooltip("disease_type:N", title="Report Type"),
+                    alt.Tooltip("bucket:T", title="Week of" if granularity == "week" else "Day"),
+                    alt.Tooltip("reports:Q", title="Reports"),
+                    alt.Tooltip("positives:Q", title="Positive"),
+                    alt.Tooltip("probability_mean:Q", title="Mean risk (%)", format=".1f"),
+                    alt.Tooltip("probability_min:Q", title="Lowest (%)", format=".1f"),
+                    alt.Tooltip("probability_max:Q", title="Highest (%)", format=".1f"),
+                ],
+            )
+            st.altair_chart((band + line).interactive(bind_y=False), use_container_width=True)
+
+    # Only the visible page's metadata is fetched; a report's HTML is read
+    # when it is opened or downloaded.
+    total = report_store.store.count(selected_type, session_id, **filters)
+    page_count = max(1, -(-total // PAGE_SIZE))
+    page = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1,
+                           key=f"reports_page_{selected_type}_{hash(tuple(filters.values()))}") if page_count > 1 else 1
+    offset = (page - 1) * PAGE_SIZE
+    visible_reports = report_store.store.page(selected_type, session_id, offset=offset, limit=PAGE_SIZE, **filters)
+    if total:
+        st.caption(f"Showing {offset + 1}–{offset + len(visible_reports)} of {total} reports")
+    else:
+        st.info("No reports match this search.")
+
+    # The archives are written only when a button is clicked. st.download_button
+    # takes whole bytes, so each archive is held in memory in full until it is
+    # served; `python report_export.py` streams the same archive instead.
+    archive_name = (user_name or "my").lower().replace(" ", "_")
+    export_type, export_all = st.columns(2)
+    export_type.download_button(
+        f"📦 Download all {selected_type} reports (ZIP)",
+        data=lambda: report_export.zip_bytes(report_store.store, session_id, selected_type),
+        file_name=f"{archive_name}_{selected_type.lower().replace(' ', '_')}_reports.zip",
+        mime="application/zip",
+        on_click="ignore",
+        key="report_export_type",
+    )
+    export_all.download_button(
+        "📦 Download every report (ZIP)",
+        data=lambda: report_export.zip_bytes(report_store.store, session_id),
+        file_name=f"{archive_name}_reports.zip",
+        mime="application/zip",
+        on_click="ignore",
+        key="report_export_all",
+    )
 
-    for i, report in enumerate(selected_reports, 1):
+    for i, report in enumerate(visible_reports, offset + 1):
         st.markdown(f"""
         <div class="report-box">
-            <div class="report-header">{i}. {report['user_name']} &nbsp; <span style='font-size:15px;color:#666;'>({report['timestamp']})</span></div>
+            <div class="report-header">{i}. {report['user_name'] or 'Unknown User'} &nbsp; <span style='font-size:15px;color:#666;'>({report['created_at']}{f", risk {report['probability']:.0%}" if report['probability'] is not None else ""})</span></div>
         """, unsafe_allow_html=True)
 
-        with st.expander("📄 View Report", expanded=False):
-            st.components.v1.html(report["html"], height=600, scrolling=True)
+        if st.toggle("📄 View Report", key=f"report_view_{report['id']}"):
+            st.components.v1.html(report_store.store.html(report["id"]), height=600, scrolling=True)
 
-        report_bytes = report["html"].encode("utf-8")
-        b64 = base64.b64encode(report_bytes).decode()
-        filename = f"{report['user_name']}_{selected_type}_report.html"
-        href = f'<a class="download-link" href="data:text/html;base64,{b64}" download="{filename}">⬇️ Download as HTML</a>'
-        st.markdown(href, unsafe_allow_html=True)
+        st.download_button(
+            "⬇️ Download as HTML",
+            data=lambda report_id=report["id"]: report_store.store.html(report_id).encode("utf-8"),
+            file_name=f"{report['user_name'] or 'report'}_{selected_type}_report.html",
+            mime="text/html",
+            on_click="ignore",
+            key=f"report_download_{report['id']}",
+        )
 
         st.markdown("</div>", unsafe_allow_html=True)
 
@@ -1,10 +1,33 @@
+import base64
 import os
 import streamlit as st
-from PIL import Image
 from streamlit_option_menu import option_menu
+import model_registry
+import warmup
 
 st.set_page_config(page_title="BioPredict", page_icon="💓", layout="wide", initial_sidebar_state="expanded")
 
+PAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+@st.cache_resource
+def compile_page(page_path, page_mtime):
+    with open(page_path, encoding="utf-8") as f:
+        return compile(f.read(), page_path, "exec")
+
+
+@st.cache_resource
+def logo_data_uri(logo_path):
+    # Inlined rather than st.image, which imports PIL and NumPy to decode it.
+    with open(logo_path, "rb") as f:
+        return "data:image/png;base64," + base64.b64encode(f.read()).decode()
+
+
+def run_page(page_file):
+    page_path = os.path.join(PAGE_DIR, page_file)
+    code = compile_page(page_path, os.path.getmtime(page_path))
+    exec(code, {"__name__": "__main__", "__file__": page_path})
+
 
 if "reports" not in st.session_state:
     st.session_state["reports"] = []
@@ -12,9 +35,10 @@ if "menu" not in st.session_state:
     st.session_state["menu"] = "Main Page"
 
 with st.sidebar:
-    logo_path = os.path.join(os.path.dirname(__file__), "logo.png")
-    image = Image.open(logo_path)    
-    st.image(image, use_column_width=True)
+    st.markdown(
+        f'<img src="{logo_data_uri(os.path.join(PAGE_DIR, "logo.png"))}" style="width: 100%;">',
+        unsafe_allow_html=True
+    )
     st.markdown(
         """
         <h1 style="
@@ -37,26 +61,36 @@ with st.sidebar:
     )
     selected = option_menu(
         menu_title="",
-        options=["Main Page", "Heart Disease Predict", "Diabetes Predict", "Parkinson's Predict", "Thyroid Predict", "Alzheimer's Predict", "My Reports"],
-        icons=["balloon", "heart", "activity", "cpu", "file-earmark-medical", "person-bounding-box", "clipboard-data"],
+        options=["Main Page", "Full Assessment", "Heart Disease Predict", "Diabetes Predict", "Parkinson's Predict", "Thyroid Predict", "Alzheimer's Predict", "My Reports"],
+        icons=["balloon", "grid", "heart", "activity", "cpu", "file-earmark-medical", "person-bounding-box", "clipboard-data"],
         default_index=[
-            "Main Page", "Heart Disease Predict", "Diabetes Predict", "Parkinson's Predict",
+            "Main Page", "Full Assessment", "Heart Disease Predict", "Diabetes Predict", "Parkinson's Predict",
             "Thyroid Predict", "Alzheimer's Predict", "My Reports"
         ].index(st.session_state["menu"]),
         key="menu"
     )
+    st.toggle("Show diagnostics", key="show_diagnostics", help="Show measured per-stage prediction timings.")
+    if not warmup.is_ready():
+        st.caption(f"⏳ Warming up models: {warmup.ready_count()}/{len(model_registry.ARTIFACTS)} ready")
 
-if selected == "Main Page":
-    exec(open("MainPage.py", encoding="utf-8").read())
-elif selected == "Heart Disease Predict":
-    exec(open("HeartDiseasePage.py", encoding="utf-8").read())
-elif selected == "Diabetes Predict":
-    exec(open("DiabetesPage.py", encoding="utf-8").read())
-elif selected == "Parkinson's Predict":
-    exec(open("ParkinsonsPage.py", encoding="utf-8").read())
-elif selected == "Thyroid Predict":
-    exec(open("ThyroidPage.py", encoding="utf-8").read())  
-elif selected == "Alzheimer's Predict":
-    exec(open("Alzheimers.py", encoding="utf-8").read())
-elif selected == "My Reports":
-    exec(open("ReportsPage.py", encoding="utf-8").read())
+# Started once the first page has rendered (or stopped), so loading the
+# models in the background never competes with a user's first paint.
+try:
+    if selected == "Main Page":
+        run_page("MainPage.py")
+    elif selected == "Full Assessment":
+        run_page("CombinedAssessmentPage.py")
+    elif selected == "Heart Disease Predict":
+        run_page("HeartDiseasePage.py")
+    elif selected == "Diabetes Predict":
+        run_page("DiabetesPage.py")
+    elif selected == "Parkinson's Predict":
+        run_page("ParkinsonsPage.py")
+    elif selected == "Thyroid Predict":
+        run_page("ThyroidPage.py")
+    elif selected == "Alzheimer's Predict":
+        run_page("Alzheimers.py")
+    elif selected == "My Reports":
+        run_page("ReportsPage.py")
+finally:
+    warmup.start()
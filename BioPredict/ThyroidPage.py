@@ -1,44 +1,11 @@
-import base64
-from datetime import datetime
-from pathlib import Path
-import pickle
 import streamlit as st
-import pandas as pd
-import joblib
-import time
-from sklearn.preprocessing import MinMaxScaler
 from textwrap import dedent
-
-ARTIFACT_DIR = Path(__file__).resolve().parent  
-MODEL_PATH = ARTIFACT_DIR / "xgb_model.pkl"
-SCALER_PATH = ARTIFACT_DIR / "thyroid_scaler.pkl" 
-
-@st.cache_resource
-def load_model(model_path, scaler_path, model_mtime, scaler_mtime):
-    model = joblib.load(model_path)
-    scaler = joblib.load(scaler_path)
-    return model, scaler
-
-model, scaler = load_model(
-    str(MODEL_PATH), str(SCALER_PATH),
-    MODEL_PATH.stat().st_mtime, SCALER_PATH.stat().st_mtime
-)
-
-if not isinstance(scaler, MinMaxScaler):
-    st.error(f"Scaler type is {type(scaler).__name__}. It must be MinMaxScaler.")
-    st.stop()
-
-
-if getattr(scaler, "n_features_in_", None) != 1:
-    st.error(f"Scaler n_features_in_ = {getattr(scaler,'n_features_in_', None)}. 1 olmalı.")
-    st.stop()
-
-fn = getattr(scaler, "feature_names_in_", None)
-if list(fn) != ["Age"]:
-    st.error(f"Scaler feature_names_in_ = {fn}. ['Age'] olmalı.")
-    st.stop()
-with open('category_mappings.pkl', 'rb') as f:
-    category_mappings = pickle.load(f)
+from batch_upload import render_batch_upload
+from diagnostics import StageTimer, render_diagnostics
+from report_download import PURPLE, render_report_download
+import report_store
+import report_templates
+import warmup
 
 user_name = st.session_state.get("user_name", "").strip()
 user_gender = st.session_state.get("user_gender", "Select")
@@ -111,6 +78,8 @@ st.markdown(
 )
 st.caption("This tool is for educational purposes only and does not provide a medical diagnosis. Results should be interpreted in conjunction with clinical evaluation.")
 
+render_batch_upload("thyroid", "Thyroid", "Thyroid_Diff.csv")
+
 
 with st.expander("", expanded=True):
     has_name = bool(user_name and str(user_name).strip())
@@ -299,18 +268,28 @@ if st.button("Predict"):
     
     if validate_inputs(input_dict):
         try:
-            with st.spinner("Making prediction..."):
-                time.sleep(2)
+            if not warmup.is_ready("thyroid"):
+                with st.spinner("Loading the model for the first time since the app started..."):
+                    warmup.wait("thyroid")
 
-            input_df = pd.DataFrame([input_dict])
+            # Heavy imports and the model wait for the first prediction so the
+            # page's form paints without them.
+            import model_registry
+            import prediction_cache
 
-            for col, cats in category_mappings.items():
-                if col in input_df.columns:
-                     input_df[col] = input_df[col].astype(pd.api.types.CategoricalDtype(categories=cats))
-            print(input_df.dtypes)
+            # The scaler is checked once, when the code tables are built from it.
+            codes = model_registry.load("thyroid")["codes"]
 
-            prediction = model.predict(input_df)            
-            prob = model.predict_proba(input_df)[0][1]
+            timer = StageTimer()
+
+            # Labels go straight to the model's category codes; Age is scaled
+            # in the same pass.
+            input_data = codes.encode({col: [value] for col, value in input_dict.items()})
+            timer.lap("encode")
+
+            prediction, probabilities = prediction_cache.predict("thyroid", input_data)
+            prob = probabilities[0]
+            timer.lap("predict")
             percent = round(prob * 100, 2)
          
             if prediction[0] == 0:
@@ -493,6 +472,7 @@ if st.button("Predict"):
 
             </div>
             """, unsafe_allow_html=True)
+            timer.lap("render")
             
             if focality == "Multifocal":
                 focality_comment = "🔬 Multifocality (more than one focus) detected."
@@ -627,150 +607,38 @@ if st.button("Predict"):
                 advice_list.append("🚫 Insufficient treatment response. Alternative methods should be considered.")
 
 
-            advice_html = "".join(f"<li>{item}</li>" for item in advice_list)
-
-            report_html = f"""
-            <html>
-            <head>
-            <style>
-            body {{
-                font-family: Arial, sans-serif;
-                line-height: 1.6;
-                padding: 20px;
-                display: flex;
-                flex-direction: column;
-                justify-content: center;
-                align-items: center;
-                min-height: 100vh;
-                text-align: center;
-            }}
-            h2 {{
-                color: #2E86C1;
-            }}
-            h3 {{
-                color: {'green' if prediction[0] == 0 else 'red'};
-            }}
-            .section {{
-                    margin-bottom: 20px;
-                    width: 100%;
-                    max-width: 600px;
-                }}
-            .section ul {{
-                    list-style-position: inside;  
-                    padding: 0;
-                    margin: 0 auto;
-                    display: inline-block;    
-                    text-align: left;         
-            }}
-            .success {{ color: green; }}
-            .warning {{ color: orange; }}
-            .error {{ color: red; }}
-            ul {{
-                list-style-type: none;
-                padding: 0;
-                text-align: left;
-            }}
-            li {{
-                margin-bottom: 10px;
-            }}
-            </style>
-            </head>
-            <body>
-            <h2>Thyroid Cancer Prediction Report</h2>
-                <h3>{'✅ No Thyroid Cancer ✅' if prediction[0] == 0 else '⚠️ Thyroid Cancer Detected ⚠️'}</h3>
-
-            <div class="section">
-                    {f'<p style="margin:0; padding:0;"><b>Name:</b> {user_name}</p>' if user_name else ""}
-                    <b>Age:</b> {age} <br>
-                    <b>Gender:</b> {user_gender}
-            </div>
-            <h3>Health Status</h3>
-            <ul> 
-                <li><span class="{physical_exam_class}">{physical_exam_comment}</span></li>
-                <li><span class="{adenopathy_class}">{adenopathy_comment}</span></li>
-                <li><span class="{focality_class}">{focality_comment}</span></li>
-                <li><span class="{risk_class}">{risk_comment}</span></li>
-                <li><span class="{tumor_class}">{tumor_comment}</span></li>
-                <li><span class="{nodes_class}">{nodes_comment}</span></li>
-                <li><span class="{thyroid_function_class}">{thyroid_function_comment}</span></li>
-                <li><span class="{stage_class}">{stage_comment}</span></li>
-                <li><span class="{metastasis_class}">{metastasis_comment}</span></li>
-                <li><span class="{response_class}">{response_comment}</span></li>
-            </ul>                   
-                
-            <div class="section">
-                    <h3 style="margin:0; padding:0;">Personalized Recommendations for {user_name}</h3>
-                    <ul>
-             {advice_html}
-                    </ul>
-            </div>
-
-            <h3>General Health Advice</h3>
-            <ul>
-                <li>Pay attention to a healthy and balanced diet.</li>
-                <li>Don't forget to drink enough water.</li>
-                <li>Try to avoid stress.</li>
-                <li>Make sure you get enough sleep.</li>
-                <li>Don't neglect regular exercise.</li>
-                <li>Limit smoking and alcohol consumption.</li>
-                <li>Don't skip your annual health check-ups.</li>
-                <li>Follow your doctor's recommendations.</li>
-                <li>Have regular check-ups to protect your thyroid health.</li>
-                <li>Practice stress management techniques.</li>
-                <li>Ensure adequate iodine intake.</li>
-                <li>Do not use medications that may affect your thyroid health without consulting your doctor.</li>
-            </ul>
-            </body>
-            </html>
-            """
-            b64_report = base64.b64encode(report_html.encode()).decode()
-            href = f'data:text/html;base64,{b64_report}'
-
-            disease_type = "Thyroid Cancer"
-
-            if "all_reports" not in st.session_state:
-                st.session_state["all_reports"] = {}
-            if disease_type not in st.session_state["all_reports"]:
-                st.session_state["all_reports"][disease_type] = []
-
-            st.session_state["all_reports"][disease_type].append({
-                "user_name": user_name or "Unknown User",
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "html": report_html
-            })
+            result = report_templates.ReportResult(
+                disease="thyroid",
+                prediction=prediction[0],
+                probability=prob,
+                statuses=[
+                    (physical_exam_class, physical_exam_comment),
+                    (adenopathy_class, adenopathy_comment),
+                    (focality_class, focality_comment),
+                    (risk_class, risk_comment),
+                    (tumor_class, tumor_comment),
+                    (nodes_class, nodes_comment),
+                    (thyroid_function_class, thyroid_function_comment),
+                    (stage_class, stage_comment),
+                    (metastasis_class, metastasis_comment),
+                    (response_class, response_comment),
+                ],
+                advice=advice_list,
+                user_name=user_name,
+                age=age,
+                gender=user_gender,
+            )
+            report_id = report_store.store.add(
+                st.session_state.setdefault("report_session", report_store.new_session_id()),
+                user_name,
+                result,
+            )
 
             safe_user_name = user_name.lower().replace(" ", "_") if user_name else "user"
             file_name = f"{safe_user_name}_thyroid_report.html"
-            b64_report = base64.b64encode(report_html.encode()).decode()
-            href = f'data:text/html;base64,{b64_report}'
-
-            st.markdown(f"""
-                <div style="text-align: center; margin-top: 40px; animation: fadeIn 3s;">
-                    <a href="{href}" download="{file_name}" style="
-                        background: linear-gradient(90deg, #8E24AA, #CE93D8);
-                        color: white;
-                        padding: 14px 30px;
-                        font-size: 18px;
-                        font-weight: bold;
-                        border-radius: 12px;
-                        text-decoration: none;
-                        box-shadow: 3px 3px 10px rgba(0,0,0,0.2);
-                        transition: 0.3s;
-                        display: inline-block;
-                    ">
-                    Thyroid Risk Report 📥
-                    </a>
-                </div>
-            """, unsafe_allow_html=True)
-
-            st.markdown("""
-            <style>
-            @keyframes fadeIn {
-                from { opacity: 0; transform: translateY(10px); }
-                to { opacity: 1; transform: translateY(0); }
-            }
-            </style>
-            """, unsafe_allow_html=True)
+            render_report_download(report_id, file_name, "Thyroid Risk Report 📥", PURPLE)
+            timer.lap("report")
+            render_diagnostics(timer)
 
         except Exception as e:
             st.error(f"An error occurred: {e}")
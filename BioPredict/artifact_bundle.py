@@ -0,0 +1,295 @@
+import hashlib
+import json
+import mmap
+import pickle
+import struct
+import sys
+import threading
+from collections.abc import Mapping
+from datetime import datetime, timezone
+from pathlib import Path
+
+MAGIC = b"BIOPRED\x00"
+FORMAT_VERSION = 1
+# Every pickle and array buffer starts on a 64-byte boundary, so NumPy views
+# over the mapped file are aligned for vectorised reads.
+ALIGNMENT = 64
+_HEADER = struct.Struct("<8sQ")
+
+
+def _padding(size):
+    return -size % ALIGNMENT
+
+
+def file_sha256(path):
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def _source_record(path):
+    if not path.exists():
+        return {"file": path.name, "sha256": None, "size": None, "mtime_ns": None}
+    stat = path.stat()
+    return {"file": path.name, "sha256": file_sha256(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _unchanged(recorded, path, deep=False):
+    """Whether path is still the file recorded at build time. By default
+    only its size and mtime are compared, which costs one stat; deep=True
+    compares its content hash instead."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return False
+    if deep:
+        return file_sha256(path) == recorded["sha256"]
+    return stat.st_size == recorded["size"] and stat.st_mtime_ns == recorded["mtime_ns"]
+
+
+def build(path, artifacts_by_disease, sources_by_disease, shared_keys=(), code_paths=None):
+    """Write every disease's loaded artifacts into one bundle file.
+
+    Each artifact is pickled with protocol 5, with its NumPy arrays taken
+    out-of-band and written as separate aligned buffers. For keys in
+    shared_keys the arrays load as read-only views over the mapped file, so
+    processes opening the same bundle share those pages through the OS page
+    cache. Other entries get private writable copies, since third-party
+    estimators such as libsvm's reject read-only buffers.
+
+    The size, mtime and hash of every source file, and of the files in
+    code_paths (the code that built the artifacts), go in the manifest, so
+    a bundle whose files or compiled objects came from elsewhere can be
+    recognised as stale.
+    """
+    segments = []
+    offset = 0
+
+    def add_segment(data):
+        nonlocal offset
+        data = memoryview(data).cast("B")
+        segments.append(data)
+        start = offset
+        offset += len(data) + _padding(len(data))
+        return [start, len(data)]
+
+    entries = {}
+    diseases = {}
+    for disease, artifacts in artifacts_by_disease.items():
+        for key, value in artifacts.items():
+            buffers = []
+            data = pickle.dumps(value, protocol=5, buffer_callback=buffers.append)
+            digest = hashlib.sha256(data)
+            raw_buffers = [buffer.raw() for buffer in buffers]
+            for raw in raw_buffers:
+                digest.update(raw)
+            entries[f"{disease}/{key}"] = {
+                "pickle": add_segment(data),
+                "buffers": [add_segment(raw) for raw in raw_buffers],
+                "sha256": digest.hexdigest(),
+                "shared": key in shared_keys,
+            }
+        diseases[disease] = {
+            "keys": list(artifacts),
+            "sources": {name: _source_record(source) for name, source in sources_by_disease[disease].items()},
+        }
+
+    version = hashlib.sha256("".join(entry["sha256"] for entry in entries.values()).encode()).hexdigest()[:16]
+    manifest = json.dumps({
+        "format": FORMAT_VERSION,
+        "version": version,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "diseases": diseases,
+        "code": {name: _source_record(source) for name, source in (code_paths or {}).items()},
+        "entries": entries,
+    }, indent=1).encode("utf-8")
+    header = _HEADER.pack(MAGIC, len(manifest)) + manifest
+    header += b"\0" * _padding(len(header))
+
+    tmp_path = Path(str(path) + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        for data in segments:
+            f.write(data)
+            f.write(b"\0" * _padding(len(data)))
+    tmp_path.replace(path)
+    return version
+
+
+class ArtifactBundle:
+    """A bundle file opened read-only. Only the manifest is parsed up front;
+    each entry is checksummed once, and unpickled on first access."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, manifest_length = _HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not an artifact bundle")
+        self.manifest = json.loads(self._mmap[_HEADER.size:_HEADER.size + manifest_length])
+        if self.manifest["format"] != FORMAT_VERSION:
+            raise ValueError(f"{self.path} has bundle format {self.manifest['format']}, expected {FORMAT_VERSION}")
+        header_size = _HEADER.size + manifest_length
+        self._data_start = header_size + _padding(header_size)
+        self._view = memoryview(self._mmap)
+        # The mapping never changes (a rebuilt bundle is a new file), so an
+        # entry that passed its checksum is not checked again.
+        self._verified = set()
+
+    @property
+    def version(self):
+        return self.manifest["version"]
+
+    def _segment(self, segment):
+        start = self._data_start + segment[0]
+        return self._view[start:start + segment[1]]
+
+    def verify_entry(self, name):
+        if name in self._verified:
+            return True
+        entry = self.manifest["entries"][name]
+        digest = hashlib.sha256(self._segment(entry["pickle"]))
+        for segment in entry["buffers"]:
+            digest.update(self._segment(segment))
+        if digest.hexdigest() != entry["sha256"]:
+            return False
+        self._verified.add(name)
+        return True
+
+    def load_entry(self, name, verify=True):
+        if verify and not self.verify_entry(name):
+            raise ValueError(f"Checksum mismatch for '{name}' in {self.path}")
+        entry = self.manifest["entries"][name]
+        buffers = [self._segment(segment) for segment in entry["buffers"]]
+        if not entry["shared"]:
+            buffers = [bytearray(buffer) for buffer in buffers]
+        return pickle.loads(self._segment(entry["pickle"]), buffers=buffers)
+
+    def matches_sources(self, disease, paths, deep=False):
+        """False if any source file that still exists differs from the one
+        the bundle was built from, i.e. the bundle is stale. See _unchanged
+        for deep."""
+        recorded = self.manifest["diseases"].get(disease)
+        if recorded is None or set(recorded["sources"]) != set(paths):
+            return False
+        return all(
+            not path.exists() or _unchanged(recorded["sources"][name], path, deep)
+            for name, path in paths.items()
+        )
+
+    def matches_code(self, paths, deep=False):
+        """False if the code that built the bundle's objects has changed
+        since."""
+        recorded = self.manifest.get("code", {})
+        return set(recorded) == set(paths) and all(
+            _unchanged(recorded[name], path, deep) for name, path in paths.items()
+        )
+
+    def verify_disease(self, disease):
+        return all(self.verify_entry(f"{disease}/{key}") for key in self.manifest["diseases"][disease]["keys"])
+
+    def artifacts(self, disease):
+        return LazyArtifacts(self, disease)
+
+
+class LazyArtifacts(Mapping):
+    """One disease's artifacts, unpickled from the bundle on first access."""
+
+    def __init__(self, bundle, disease):
+        self.bundle = bundle
+        self.disease = disease
+        self._keys = bundle.manifest["diseases"][disease]["keys"]
+        self._loaded = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, key):
+        if key not in self._loaded:
+            if key not in self._keys:
+                raise KeyError(key)
+            with self._lock:
+                if key not in self._loaded:
+                    self._loaded[key] = self.bundle.load_entry(f"{self.disease}/{key}")
+        return self._loaded[key]
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+
+_open_lock = threading.Lock()
+_opened = {}
+
+
+def open_bundle(path):
+    """The bundle at path, opened once per process and reopened when the file
+    changes; None if there is no usable bundle."""
+    path = Path(path)
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    key = (stat.st_mtime_ns, stat.st_size)
+    with _open_lock:
+        cached = _opened.get(path)
+        if cached is None or cached[0] != key:
+            try:
+                cached = (key, ArtifactBundle(path))
+            except (ValueError, KeyError, struct.error):
+                cached = (key, None)
+            _opened[path] = cached
+    return cached[1]
+
+
+def main(argv=None):
+    import argparse
+
+    import model_registry
+
+    parser = argparse.ArgumentParser(description="Build or check the consolidated model artifact bundle.")
+    parser.add_argument("command", choices=["build", "verify", "info"])
+    parser.add_argument("--path", type=Path, default=model_registry.BUNDLE_PATH)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        artifacts = {disease: model_registry.load_from_files(disease) for disease in model_registry.ARTIFACTS}
+        sources = {disease: model_registry.artifact_paths(disease) for disease in model_registry.ARTIFACTS}
+        version = build(args.path, artifacts, sources, model_registry.COMPILED_ARTIFACTS,
+                        model_registry.kernel_paths())
+        print(f"Wrote {args.path.name} version {version}, {args.path.stat().st_size / 1024:.0f} KB")
+
+        live = {path.name for paths in sources.values() for path in paths.values()}
+        orphaned = sorted(
+            path.name for path in model_registry.ARTIFACT_DIR.iterdir()
+            if path.suffix in (".pkl", ".joblib") and path.name not in live
+        )
+        if orphaned:
+            print(f"Not loaded by any page, so not bundled: {', '.join(orphaned)}")
+        return 0
+
+    bundle = ArtifactBundle(args.path)
+    print(f"{args.path.name}: format {bundle.manifest['format']}, version {bundle.version}, "
+          f"built {bundle.manifest['created']}")
+    # info trusts size and mtime like the loader does; verify hashes the files.
+    deep = args.command == "verify"
+    failed = not bundle.matches_code(model_registry.kernel_paths(), deep)
+    print(f"  {'code':<10} {'STALE: kernel modules changed, rebuild the bundle' if failed else 'current'}")
+    for disease in bundle.manifest["diseases"]:
+        current = bundle.matches_sources(disease, model_registry.artifact_paths(disease), deep)
+        failed |= not current
+        print(f"  {disease:<10} {'current' if current else 'STALE: source files changed, rebuild the bundle'}")
+    for name, entry in bundle.manifest["entries"].items():
+        size = entry["pickle"][1] + sum(segment[1] for segment in entry["buffers"])
+        line = (f"    {name:<30} {size / 1024:8.1f} KB in {1 + len(entry['buffers']):3} segments"
+                f"  {'shared' if entry['shared'] else 'private'}")
+        if args.command == "verify":
+            ok = bundle.verify_entry(name)
+            failed |= not ok
+            line += "  ok" if ok else "  CHECKSUM MISMATCH"
+        print(line)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+import pandas as pd
+
+import model_registry
+
+DIABETES_COLUMNS = [
+    'Pregnancies', 'Glucose', 'BloodPressure', 'SkinThickness',
+    'Insulin', 'BMI', 'DiabetesPedigreeFunction', 'Age'
+]
+
+HEART_NUMERIC_COLUMNS = ['Age', 'RestingBP', 'Cholesterol', 'FastingBS', 'MaxHR', 'Oldpeak']
+HEART_SEX_VALUES = {'M': 'Male', 'F': 'Female'}
+
+# Same renames Thyroid.ipynb applied to Thyroid_Diff.csv before training
+# xgb_model.pkl; its value replacements live in thyroid_kernels.THYROID_ALIASES.
+THYROID_RENAMES = {
+    'Pathology': 'Types of Thyroid Cancer (Pathology)',
+    'T': 'Tumor',
+    'N': 'Lymph Nodes',
+    'Response': 'Treatment Response',
+}
+
+# Up to this many rows the compiled NumPy forest beats xgboost's own predictor;
+# both give bit-identical probabilities.
+COMPILED_FOREST_MAX_ROWS = 64
+
+ALZHEIMER_SCALED_COLUMNS = [
+    'Age', 'BMI', 'AlcoholConsumption', 'PhysicalActivity', 'DietQuality',
+    'SystolicBP', 'DiastolicBP', 'CholesterolTotal', 'CholesterolLDL',
+    'CholesterolHDL', 'CholesterolTriglycerides', 'MMSE',
+    'FunctionalAssessment', 'ADL'
+]
+
+
+def _require_columns(frame, columns):
+    missing = [col for col in columns if col not in frame.columns]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+
+
+def _numeric(frame, columns):
+    numeric = frame[columns].apply(pd.to_numeric, errors="coerce")
+    invalid = numeric.isna().sum()
+    invalid = invalid[invalid > 0]
+    if not invalid.empty:
+        details = ", ".join(f"'{col}' ({count} rows)" for col, count in invalid.items())
+        raise ValueError(f"Non-numeric or empty values in {details}")
+    return numeric.astype(float)
+
+
+def prepare_diabetes(frame, artifacts):
+    _require_columns(frame, DIABETES_COLUMNS)
+    # The compiled kernel has the scaler folded in, so it takes raw values.
+    return _numeric(frame, DIABETES_COLUMNS).to_numpy()
+
+
+def prepare_heart(frame, artifacts):
+    _require_columns(frame, artifacts["feature_names"])
+
+    values = {col: frame[col].astype(str).str.strip() for col in artifacts["pipeline"].codes}
+    values['Sex'] = values['Sex'].replace(HEART_SEX_VALUES)
+    values.update(_numeric(frame, HEART_NUMERIC_COLUMNS))
+    # Unscaled; the compiled pipeline applies both scalers itself.
+    return artifacts["pipeline"].encode(values)
+
+
+def prepare_parkinson(frame, artifacts):
+    feature_names = artifacts["feature_names"]
+    _require_columns(frame, feature_names)
+    X = _numeric(frame, feature_names)
+    X[feature_names] = artifacts["scaler"].transform(X[feature_names])
+    return X
+
+
+def prepare_thyroid(frame, artifacts):
+    frame = frame.rename(columns=THYROID_RENAMES)
+    codes = artifacts["codes"]
+    _require_columns(frame, codes.feature_names)
+    return codes.encode({
+        col: _numeric(frame, [col])[col] if col == 'Age' else frame[col]
+        for col in codes.feature_names
+    })
+
+
+def prepare_alzheimer(frame, artifacts):
+    feature_names = artifacts["feature_names"]
+    _require_columns(frame, feature_names)
+    X = _numeric(frame, feature_names)
+
+    scalers = artifacts["scalers"]
+    if scalers is not None:
+        # Alzheimers.ipynb fitted the standard scaler on min-max scaled columns.
+        cols = scalers.get('columns', ALZHEIMER_SCALED_COLUMNS)
+        if 'minmax' in scalers:
+            X[cols] = scalers['minmax'].transform(X[cols])
+        if 'standard' in scalers:
+            X[cols] = scalers['standard'].transform(X[cols])
+    return X
+
+
+PREPARERS = {
+    "heart": prepare_heart,
+    "diabetes": prepare_diabetes,
+    "parkinson": prepare_parkinson,
+    "thyroid": prepare_thyroid,
+    "alzheimer": prepare_alzheimer,
+}
+
+
+def prepare(disease, frame):
+    if frame.empty:
+        raise ValueError("The uploaded file has no rows.")
+    return PREPARERS[disease](frame, model_registry.load(disease))
+
+
+def predict(disease, X):
+    artifacts = model_registry.load(disease)
+    if disease == "diabetes":
+        predictions, probabilities = artifacts["kernel"].score(X)
+        return predictions, probabilities[:, 1]
+    if disease == "heart":
+        predictions, probabilities = artifacts["pipeline"].score(X)
+        return predictions, probabilities[:, 1]
+
+    if "forest" in artifacts and len(X) <= COMPILED_FOREST_MAX_ROWS:
+        model = artifacts["forest"]
+    else:
+        model = artifacts["model"]
+    probabilities = model.predict_proba(X)[:, 1]
+    return (probabilities > 0.5).astype(int), probabilities
+
+
+def score(disease, frame):
+    X = prepare(disease, frame)
+    predictions, probabilities = predict(disease, X)
+    results = frame.copy()
+    results["Prediction"] = predictions
+    results["Probability"] = probabilities
+    return results
@@ -0,0 +1,39 @@
+import streamlit as st
+
+
+def render_batch_upload(disease, label, example_file):
+    with st.expander(f"📂 Batch {label} Scoring (CSV Upload)", expanded=False):
+        st.caption(
+            f"Upload a cohort file with the same columns as {example_file}. "
+            "Every row is validated, encoded and scored in one pass."
+        )
+        cohort_file = st.file_uploader("Cohort file", type=["csv", "data", "txt"], key=f"{disease}_cohort_file")
+        if cohort_file is None:
+            return
+
+        # pandas and the models load only once a cohort is uploaded.
+        import pandas as pd
+        import batch_scoring
+
+        state_key = f"{disease}_cohort_results"
+        cached = st.session_state.get(state_key)
+        if cached is None or cached[0] != cohort_file.file_id:
+            try:
+                results = batch_scoring.score(disease, pd.read_csv(cohort_file))
+            except ValueError as e:
+                st.error(f"❌ {e}")
+                return
+            cached = (cohort_file.file_id, results)
+            st.session_state[state_key] = cached
+
+        results = cached[1]
+        positives = int(results["Prediction"].sum())
+        st.success(f"Scored {len(results)} rows: {positives} predicted at risk, {len(results) - positives} not at risk.")
+        st.dataframe(results.head(100), use_container_width=True)
+        st.download_button(
+            "⬇️ Download Results (CSV)",
+            data=results.to_csv(index=False).encode("utf-8"),
+            file_name=f"{disease}_batch_results.csv",
+            mime="text/csv",
+            key=f"{disease}_cohort_download",
+        )
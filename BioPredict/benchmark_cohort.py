@@ -0,0 +1,63 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import model_registry
+import score_cohort
+
+
+def synthesize_cohort(path, rows, seed=0):
+    """Resample alzheimers_disease_data.csv to `rows` patients, jittering the
+    continuous measurements so the cohort is not just repeated rows."""
+    source = pd.read_csv(model_registry.ARTIFACT_DIR / "alzheimers_disease_data.csv")
+    rng = np.random.default_rng(seed)
+    cohort = source.iloc[rng.integers(0, len(source), rows)].reset_index(drop=True)
+    for col in ['BMI', 'AlcoholConsumption', 'PhysicalActivity', 'DietQuality', 'MMSE', 'FunctionalAssessment', 'ADL']:
+        low, high = source[col].min(), source[col].max()
+        cohort[col] = (cohort[col] * rng.uniform(0.95, 1.05, rows)).clip(low, high).round(6)
+    cohort['PatientID'] = np.arange(1, rows + 1)
+    cohort.to_csv(path, index=False)
+
+
+def worker_counts(max_workers):
+    counts = [1]
+    while counts[-1] * 2 < max_workers:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != max_workers:
+        counts.append(max_workers)
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scaling curve of score_cohort's process pool on a synthetic Alzheimer's cohort.")
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cohort_path = os.path.join(tmp, "cohort.csv")
+        synthesize_cohort(cohort_path, args.rows)
+        model_registry.load("alzheimer")
+        print(f"{args.rows} rows, {os.path.getsize(cohort_path) / 2**20:.1f} MB, {os.cpu_count()} CPUs")
+
+        start = time.perf_counter()
+        score_cohort.score_file("alzheimer", cohort_path, os.path.join(tmp, "baseline.csv"))
+        baseline = time.perf_counter() - start
+        print(f"{'no pool':>9}  {baseline:7.2f}s  {args.rows / baseline:10,.0f} rows/s  1.00x")
+
+        for workers in worker_counts(args.max_workers):
+            output_path = os.path.join(tmp, f"pool-{workers}.csv")
+            start = time.perf_counter()
+            score_cohort.score_file_parallel("alzheimer", cohort_path, output_path, workers)
+            elapsed = time.perf_counter() - start
+            print(f"{workers:>9}  {elapsed:7.2f}s  {args.rows / elapsed:10,.0f} rows/s  {baseline / elapsed:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+import argparse
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import report_store
+import report_templates
+from timing import best_ms
+
+
+def synthetic_results(count, seed=0):
+    """ReportResults shaped like the pages' own."""
+    rng = random.Random(seed)
+    diseases = list(report_templates.REPORTS)
+    for i in range(count):
+        disease = diseases[i % len(diseases)]
+        yield report_templates.ReportResult(
+            disease=disease,
+            prediction=rng.randint(0, 1),
+            probability=rng.random(),
+            statuses=[(css, f"{'✅⚠️❗'[code]} {disease} feature {j} is {css}.")
+                      for j in range(rng.randint(3, 15))
+                      for code, css in [rng.choice(list(enumerate(report_templates.STATUS_CLASSES)))]],
+            advice=[f"⚠️ {disease} advice {rng.randint(0, 30)}: see a specialist about feature {j}."
+                    for j in range(rng.randint(1, 8))],
+            user_name=f"Patient {i % 500}",
+            age=rng.randint(20, 90),
+            gender=rng.choice(("Male", "Female")),
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Memory, write and query costs of report_store over a synthetic year of reports.")
+    parser.add_argument("--reports", type=int, default=99_000, help="reports in the synthetic year")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bench = report_store.ReportStore(Path(tmp) / "reports.db")
+        results = list(synthetic_results(1000))
+
+        # What a saved report costs in memory: the rendered HTML that used
+        # to be kept per report, against the record it is now rendered from.
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        html_reports = [report_templates.render(result) for result in results]
+        html_bytes = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(before, "filename"))
+        for i, result in enumerate(results):
+            bench.add(f"s{i % 50}", result.user_name, result)
+        before = tracemalloc.take_snapshot()
+        records = [bench.record(report_id) for report_id in range(1, len(results) + 1)]
+        record_bytes = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(before, "filename"))
+        tracemalloc.stop()
+        print(f"1,000 reports in memory: HTML {html_bytes / 1000:,.0f} B each, "
+              f"records {record_bytes / 1000:,.0f} B each ({html_bytes / record_bytes:.1f}x smaller)")
+        assert all(bench.html(record.id) == html for record, html in zip(records, html_reports))
+        print("every record renders to the same HTML as its result")
+
+        # A year of reports: 500 sessions with ~180 each, plus one clinic
+        # kiosk session that saved every tenth report.
+        types = [report["name"] for report in report_templates.REPORTS.values()]
+        start = time.perf_counter()
+        for i, result in enumerate(synthetic_results(args.reports, seed=1)):
+            result.disease = report_templates.DISEASES_BY_NAME[types[(i // 500) % 5]]
+            created = datetime(2026, 1, 1) + timedelta(minutes=i * 365 * 24 * 60 // args.reports)
+            bench.add("clinic" if i % 10 == 0 else f"s{i % 500}", result.user_name, result,
+                      created_at=created.strftime(report_store.TIMESTAMP_FORMAT))
+        print(f"{args.reports:,} more reports added in {time.perf_counter() - start:.2f}s, "
+              f"{Path(bench.path).stat().st_size / (args.reports + len(results)):,.0f} B of database each")
+
+        start = time.perf_counter()
+        report_id = bench.add("s1", "user 1", results[1])
+        print(f"one add: {(time.perf_counter() - start) * 1000:.2f} ms (id {report_id})")
+
+        for label, fn in [
+            ("disease_types(session)", lambda: bench.disease_types("s7")),
+            ("count(session, type)", lambda: [bench.count("Diabetes", "s7")]),
+            ("page(session, type)", lambda: bench.page("Diabetes", "s7", offset=10)),
+            ("html(id)", lambda: [bench.html(report_id)]),
+            ("search(session, words)", lambda: bench.page("Diabetes", "s7", query="advice 17")),
+            ("search(session, risk, month)", lambda: bench.page("Heart Disease", "s5", min_probability=0.6,
+                                                                since=date(2026, 6, 1), until=date(2026, 6, 30))),
+            ("search(clinic, all)", lambda: [bench.count("Parkinson", "clinic", query="Patient 40",
+                                                          min_probability=0.6, since="2026-03-01")]
+                                             + bench.page("Parkinson", "clinic", query="Patient 40",
+                                                          min_probability=0.6, since="2026-03-01")),
+            ("search(clinic, common)", lambda: [bench.count("Alzheimer", "clinic", query="specialist")]
+                                               + bench.page("Alzheimer", "clinic", query="specialist")),
+        ]:
+            print(f"{label:<28} {best_ms(fn, 100):.3f} ms, {len(fn())} rows")
+
+        # The clinic's risk timeline, from the running totals against
+        # grouping its tenth of the reports on every read.
+        naive = ("SELECT disease_type, {bucket} AS bucket, count(*), sum(prediction), avg(probability), "
+                 "min(probability), max(probability) FROM reports WHERE session_id = ? "
+                 "GROUP BY disease_type, bucket ORDER BY disease_type, bucket")
+        buckets = {"day": "substr(created_at, 1, 10)",
+                   "week": "date(created_at, '-' || ((strftime('%w', created_at) + 6) % 7) || ' days')"}
+        with bench.connection() as conn:
+            for granularity in report_store.GRANULARITIES:
+                rows = conn.execute(naive.format(bucket=buckets[granularity]), ("clinic",)).fetchall()
+                timeline = bench.timeline("clinic", granularity=granularity)
+                assert [tuple(row)[:4] for row in rows] == [tuple(row)[:4] for row in timeline]
+                assert all(abs(row[4] - kept["probability_mean"]) < 1e-9 for row, kept in zip(rows, timeline))
+                kept_ms = best_ms(lambda: bench.timeline("clinic", granularity=granularity), 20)
+                grouped_ms = best_ms(lambda: conn.execute(naive.format(bucket=buckets[granularity]),
+                                                          ("clinic",)).fetchall(), 20)
+                print(f"timeline(clinic, {granularity:<4}) {kept_ms:.3f} ms, {len(timeline)} rows "
+                      f"(grouping the reports: {grouped_ms:.1f} ms)")
+
+        with bench.connection() as conn:
+            for sql, params in [
+                ("SELECT DISTINCT disease_type FROM reports WHERE session_id = ?", ("s7",)),
+                ("SELECT id, user_name, disease_type, created_at FROM reports WHERE session_id = ? AND disease_type = ? "
+                 "ORDER BY created_at, id LIMIT 10 OFFSET 10", ("s7", "Diabetes")),
+                ("SELECT id FROM reports WHERE " + bench._where("clinic", "Alzheimer", query="specialist")[0],
+                 bench._where("clinic", "Alzheimer", query="specialist")[1]),
+            ]:
+                plan = " / ".join(row["detail"] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params))
+                print(f"plan: {plan}")
+        bench.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
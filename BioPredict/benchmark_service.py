@@ -0,0 +1,110 @@
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+import pandas as pd
+
+import model_registry
+
+# (max batch, max wait ms): no batching, then two micro-batching settings.
+SETTINGS = [(1, 0.0), (64, 2.0), (64, 10.0)]
+CONCURRENCY = [1, 10, 100]
+
+
+async def client(host, port, path, bodies, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for body in bodies:
+            start = time.perf_counter()
+            writer.write(
+                f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+            )
+            await writer.drain()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, path, bodies, clients, requests_per_client):
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        client(host, port, path,
+               [bodies[(c * requests_per_client + i) % len(bodies)] for i in range(requests_per_client)],
+               latencies)
+        for c in range(clients)
+    ))
+    return time.perf_counter() - start, latencies
+
+
+def wait_until_ready(port, timeout=120):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1):
+                return
+        except OSError:
+            time.sleep(0.25)
+    raise RuntimeError("inference_service did not start")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Latency/throughput of inference_service at 1, 10 and 100 clients.")
+    parser.add_argument("--disease", choices=list(model_registry.SAMPLE_DATA), default="alzheimer")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per run, split across the clients")
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args(argv)
+
+    frame = pd.read_csv(model_registry.ARTIFACT_DIR / model_registry.SAMPLE_DATA[args.disease])
+    bodies = [json.dumps(record).encode("utf-8") for record in frame.to_dict("records")]
+    path = f"/predict/{args.disease}"
+    print(f"{args.disease}, {args.requests} requests per run, {os.cpu_count()} CPUs")
+    print(f"{'batch':>5} {'wait ms':>7} {'clients':>7} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'mean batch':>10}")
+
+    for max_batch, max_wait_ms in SETTINGS:
+        server = subprocess.Popen(
+            [sys.executable, str(model_registry.ARTIFACT_DIR / "inference_service.py"), "--port", str(args.port),
+             "--max-batch", str(max_batch), "--max-wait-ms", str(max_wait_ms)],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            wait_until_ready(args.port)
+            # Warm up caches and the first-call paths before measuring.
+            asyncio.run(run_load("127.0.0.1", args.port, path, bodies, 4, 25))
+            for clients in CONCURRENCY:
+                with urllib.request.urlopen(f"http://127.0.0.1:{args.port}/stats") as r:
+                    before = json.load(r)[args.disease]
+                per_client = max(1, args.requests // clients)
+                elapsed, latencies = asyncio.run(run_load("127.0.0.1", args.port, path, bodies, clients, per_client))
+                with urllib.request.urlopen(f"http://127.0.0.1:{args.port}/stats") as r:
+                    after = json.load(r)[args.disease]
+
+                batches = after["batches"] - before["batches"]
+                mean_batch = (after["requests"] - before["requests"]) / batches if batches else 0.0
+                latencies_ms = sorted(latency * 1000 for latency in latencies)
+                p99 = latencies_ms[min(len(latencies_ms) - 1, int(len(latencies_ms) * 0.99))]
+                print(f"{max_batch:>5} {max_wait_ms:>7g} {clients:>7} {len(latencies) / elapsed:>9,.0f} "
+                      f"{statistics.median(latencies_ms):>8.2f} {p99:>8.2f} {mean_batch:>10.1f}")
+        finally:
+            server.terminate()
+            server.wait()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+import argparse
+import os
+import subprocess
+import sys
+
+import model_registry
+
+# Recorded on the 1-CPU reference box after the lazy-import change. The
+# sidebar and main page's first run took ~0.65 s and each prediction page's
+# form ~0.25 s (1.4-2.3 s before, when pandas, altair and the models loaded
+# as the page opened). The budgets leave headroom for slower machines but
+# still fail if a heavy library creeps back onto a first-paint path.
+FIRST_PAINT_BUDGET_MS = {
+    "StreamlitRun.py": 1500,
+    "CombinedAssessmentPage.py": 600,
+    "HeartDiseasePage.py": 600,
+    "DiabetesPage.py": 600,
+    "ParkinsonsPage.py": 600,
+    "ThyroidPage.py": 600,
+    "Alzheimers.py": 600,
+    "ReportsPage.py": 600,
+}
+
+# Must not be imported before a page first paints; they load with the first
+# prediction. pandas and pyarrow are not listed: streamlit-option-menu needs
+# them to marshal the sidebar menu.
+DEFERRED_MODULES = (
+    "altair", "joblib", "sklearn", "xgboost", "scipy", "PIL", "vega_datasets",
+    "prediction_cache", "batch_scoring", "combined_scoring",
+    "heart_kernels", "linear_kernels", "thyroid_kernels", "tree_kernels",
+)
+
+MARKER = "import time: -- first paint --"
+
+# Streamlit itself is already imported when a page runs, so it is imported
+# before the marker and only the page's own imports are attributed to it.
+DRIVER = f"""
+import sys, time
+from streamlit.testing.v1 import AppTest
+sys.stderr.write({MARKER!r} + "\\n")
+start = time.perf_counter()
+app = AppTest.from_file(sys.argv[1], default_timeout=60).run()
+sys.stderr.write(f"first paint ms: {{(time.perf_counter() - start) * 1000}}\\n")
+sys.exit(1 if app.exception else 0)
+"""
+
+
+def parse_importtime(stderr):
+    """Returns [(module, self_us, cumulative_us, depth)] from -X importtime output."""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line or line == MARKER:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        imports.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return imports
+
+
+def profile_first_paint(script):
+    """Runs one script the way Streamlit would and returns its first-paint
+    time in ms and the parsed timings of the imports it triggered."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", DRIVER, str(model_registry.ARTIFACT_DIR / script)],
+        cwd=model_registry.ARTIFACT_DIR, capture_output=True, text=True,
+        # The background warm-up starts after the first paint; it would only
+        # add its own imports to the profile.
+        env=dict(os.environ, BIOPREDICT_WARMUP="0"),
+    )
+    if result.returncode != 0 or MARKER not in result.stderr:
+        raise RuntimeError(f"{script} failed:\n{result.stderr[-2000:]}")
+    after = result.stderr.split(MARKER, 1)[1]
+    paint_ms = float(after.rsplit("first paint ms: ", 1)[1].split()[0])
+    return paint_ms, parse_importtime(after)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check each page's cold first paint against the recorded budget.")
+    parser.add_argument("scripts", nargs="*", default=list(FIRST_PAINT_BUDGET_MS))
+    parser.add_argument("--repeat", type=int, default=3, help="runs to take the fastest of (default: 3)")
+    parser.add_argument("--top", type=int, default=3, help="slowest top-level imports to list (default: 3)")
+    args = parser.parse_args(argv)
+
+    failures = []
+    for script in args.scripts:
+        paint_ms, imports = min((profile_first_paint(script) for _ in range(args.repeat)), key=lambda run: run[0])
+        budget_ms = FIRST_PAINT_BUDGET_MS.get(script, min(FIRST_PAINT_BUDGET_MS.values()))
+        import_ms = sum(self_us for _, self_us, _, _ in imports) / 1000
+        top_level = sorted((imp for imp in imports if imp[3] == 0), key=lambda imp: -imp[2])[:args.top]
+        print(f"{script:<28} {paint_ms:6.0f} ms (budget {budget_ms}), {import_ms:4.0f} ms in {len(imports)} imports"
+              + "".join(f"; {name} {cumulative_us / 1000:.0f} ms" for name, _, cumulative_us, _ in top_level))
+
+        loaded = {name for name, _, _, _ in imports} | {name.split(".")[0] for name, _, _, _ in imports}
+        failures += [f"{script} imports {name} before it paints" for name in DEFERRED_MODULES if name in loaded]
+        if paint_ms > budget_ms:
+            failures.append(f"{script} took {paint_ms:.0f} ms to paint, over its {budget_ms} ms budget")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+import batch_scoring
+import prediction_cache
+
+DISEASES = ("heart", "diabetes", "parkinson", "thyroid", "alzheimer")
+
+# One pool per process, shared by every session's combined assessment. The
+# compiled kernels and xgboost spend their time in NumPy/C++ and release the
+# GIL there, so the five models overlap instead of queueing.
+executor = ThreadPoolExecutor(max_workers=len(DISEASES), thread_name_prefix="biopredict-score")
+
+
+def score_one(disease, record):
+    start = time.perf_counter()
+    X = batch_scoring.prepare(disease, pd.DataFrame([record]))
+    predictions, probabilities = prediction_cache.predict(disease, X)
+    return {
+        "prediction": int(predictions[0]),
+        "probability": float(probabilities[0]),
+        "elapsed_ms": (time.perf_counter() - start) * 1000,
+    }
+
+
+def score_all(records):
+    """Score one patient for every disease in records at once.
+
+    records maps a disease to one row in that disease's CSV columns. Returns
+    {disease: result} and the wall time in ms; a row a model rejects gets
+    {"error": message} instead of failing the whole assessment.
+    """
+    start = time.perf_counter()
+    futures = {disease: executor.submit(score_one, disease, record) for disease, record in records.items()}
+
+    results = {}
+    for disease, future in futures.items():
+        try:
+            results[disease] = future.result()
+        except ValueError as e:
+            results[disease] = {"error": str(e)}
+    return results, (time.perf_counter() - start) * 1000
@@ -0,0 +1,36 @@
+import time
+
+import streamlit as st
+
+
+class StageTimer:
+    def __init__(self):
+        self.stages = []
+        self._last = time.perf_counter()
+
+    def lap(self, stage):
+        now = time.perf_counter()
+        self.stages.append((stage, (now - self._last) * 1000))
+        self._last = now
+
+    def total_ms(self):
+        return sum(ms for _, ms in self.stages)
+
+
+def render_diagnostics(timer):
+    if not st.session_state.get("show_diagnostics", False):
+        return
+
+    import prediction_cache
+
+    with st.expander("⏱️ Diagnostics", expanded=False):
+        rows = [{"Stage": stage, "Time (ms)": round(ms, 2)} for stage, ms in timer.stages]
+        rows.append({"Stage": "total", "Time (ms)": round(timer.total_ms(), 2)})
+        st.table(rows)
+
+        stats = prediction_cache.cache.stats()
+        st.caption(
+            f"Prediction cache: {stats['size']}/{stats['max_size']} entries, "
+            f"{stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.0%} hit rate), "
+            f"{stats['evictions']} evicted, {stats['expirations']} expired"
+        )
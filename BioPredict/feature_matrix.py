@@ -0,0 +1,23 @@
+import numpy as np
+import pandas as pd
+
+
+def as_matrix(X, feature_names=None, dtype=np.float32):
+    """X as a 2-D array of dtype, with a DataFrame's columns put in
+    feature_names order first. Categorical columns become their category
+    codes, NaN where the value is missing."""
+    if isinstance(X, pd.DataFrame):
+        if feature_names is not None and list(X.columns) != feature_names:
+            X = X[feature_names]
+        if not any(isinstance(column_dtype, pd.CategoricalDtype) for column_dtype in X.dtypes):
+            return X.to_numpy(dtype=dtype)
+        matrix = np.empty(X.shape, dtype=dtype)
+        for i, name in enumerate(X.columns):
+            values = X[name].array
+            if isinstance(values, pd.Categorical):
+                codes = values.codes
+                matrix[:, i] = np.where(codes < 0, np.nan, codes)
+            else:
+                matrix[:, i] = np.asarray(values, dtype=dtype)
+        return matrix
+    return np.atleast_2d(np.asarray(X, dtype=dtype))
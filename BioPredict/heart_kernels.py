@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+
+from tree_kernels import CompiledForest
+
+
+class CompiledHeartPipeline:
+    """heart_model.pkl compiled into lookups, one affine step and a forest.
+
+    The label encoders become dicts. StandardScaler and MinMaxScaler become a
+    single per-column (x - shift) / divisor * multiplier + offset, with
+    identity entries for untouched columns, so the scaled values are exactly
+    the ones sklearn computes. The gradient-boosted trees run on a
+    CompiledForest.
+    """
+
+    def __init__(self, feature_names, codes, shift, divisor, multiplier, offset, forest, classes):
+        self.feature_names = list(feature_names)
+        self.codes = codes
+        self.shift = shift
+        self.divisor = divisor
+        self.multiplier = multiplier
+        self.offset = offset
+        self.forest = forest
+        self.classes = np.asarray(classes)
+
+    @classmethod
+    def from_bundle(cls, artifacts):
+        feature_names = list(artifacts["feature_names"])
+        codes = {
+            col: {value: code for code, value in enumerate(le.classes_)}
+            for col, le in artifacts["le_dict"].items()
+        }
+
+        shift = np.zeros(len(feature_names))
+        divisor = np.ones(len(feature_names))
+        multiplier = np.ones(len(feature_names))
+        offset = np.zeros(len(feature_names))
+
+        scaler = artifacts["scaler"]
+        for i, col in enumerate(artifacts["scaler_features"]):
+            j = feature_names.index(col)
+            if scaler.with_mean:
+                shift[j] = scaler.mean_[i]
+            if scaler.with_std:
+                divisor[j] = scaler.scale_[i]
+
+        mms = artifacts["mms"]
+        for i, col in enumerate(artifacts["mms_features"]):
+            j = feature_names.index(col)
+            multiplier[j] = mms.scale_[i]
+            offset[j] = mms.min_[i]
+
+        model = artifacts["model"]
+        return cls(feature_names, codes, shift, divisor, multiplier, offset,
+                   CompiledForest.from_sklearn_gb(model), model.classes_)
+
+    def encode(self, frame):
+        """Raw patient values (categoricals as labels) to an unscaled matrix.
+
+        frame is a DataFrame or a dict of equal-length columns.
+        """
+        X = np.empty((len(frame[self.feature_names[0]]), len(self.feature_names)), dtype=np.float64)
+        for j, col in enumerate(self.feature_names):
+            if col not in self.codes:
+                X[:, j] = np.asarray(frame[col], dtype=np.float64)
+                continue
+            values = np.asarray(frame[col], dtype=object)
+            lookup = self.codes[col]
+            X[:, j] = np.fromiter((lookup.get(value, np.nan) for value in values), np.float64, len(values))
+            unknown = np.isnan(X[:, j])
+            if unknown.any():
+                bad = ", ".join(sorted(map(str, pd.unique(values[unknown])))[:5])
+                raise ValueError(f"Unknown values for {col} in {unknown.sum()} rows: {bad}")
+        return X
+
+    def transform(self, X):
+        return (X - self.shift) / self.divisor * self.multiplier + self.offset
+
+    def score(self, X):
+        margin = self.forest.predict_margin(self.transform(X))
+        # Same rule as GradientBoostingClassifier.predict: margin >= 0.
+        predictions = self.classes[(margin >= 0).astype(int)]
+        positive = 1 / (1 + np.exp(-margin))
+        return predictions, np.column_stack([1 - positive, positive])
+
+
+def sklearn_score(artifacts, raw, numeric_columns):
+    """heart_model.pkl's own encoders, scalers and model on raw patient
+    values: what CompiledHeartPipeline must reproduce."""
+    X = pd.DataFrame(index=raw.index)
+    X[numeric_columns] = raw[numeric_columns].astype(float)
+    for col, le in artifacts["le_dict"].items():
+        X[col] = le.transform(raw[col])
+    X = X[artifacts["feature_names"]]
+    X[artifacts["scaler_features"]] = artifacts["scaler"].transform(X[artifacts["scaler_features"]])
+    X[artifacts["mms_features"]] = artifacts["mms"].transform(X[artifacts["mms_features"]])
+    return artifacts["model"].predict(X), artifacts["model"].predict_proba(X)
+
+
+if __name__ == "__main__":
+    import warnings
+
+    import batch_scoring
+    import model_registry
+    from timing import best_ms
+
+    warnings.filterwarnings("ignore")
+
+    artifacts = model_registry.load("heart")
+    pipeline = artifacts["pipeline"]
+    frame = pd.read_csv(model_registry.ARTIFACT_DIR / "heart.csv")
+    frame["Sex"] = frame["Sex"].replace(batch_scoring.HEART_SEX_VALUES)
+    row = frame.iloc[[0]]
+
+    def reference(raw):
+        return sklearn_score(artifacts, raw, batch_scoring.HEART_NUMERIC_COLUMNS)
+
+    def compiled(raw):
+        return pipeline.score(pipeline.encode(raw))
+
+    # Equivalence with sklearn is checked by tests/test_heart_kernels.py.
+    print(f"heart: {len(frame)} rows")
+    print(f"  1 row     sklearn {best_ms(lambda: reference(row), 200):7.3f} ms"
+          f"   compiled {best_ms(lambda: compiled(row), 200):7.3f} ms")
+    print(f"  {len(frame)} rows  sklearn {best_ms(lambda: reference(frame), 20):7.3f} ms"
+          f"   compiled {best_ms(lambda: compiled(frame), 20):7.3f} ms")
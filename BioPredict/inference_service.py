@@ -0,0 +1,234 @@
+import argparse
+import asyncio
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+import batch_scoring
+import model_registry
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_MAX_BATCH = 64
+DEFAULT_MAX_WAIT_MS = 5.0
+MAX_BODY_BYTES = 1024 * 1024
+
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+                500: "Internal Server Error"}
+
+
+def score_records(disease, records):
+    """Score a micro-batch in one vectorized call. If a record fails
+    validation, prepare the records one by one so only that request gets
+    an {"error": ...} result. Failures in scoring itself are raised."""
+    try:
+        X = batch_scoring.prepare(disease, pd.DataFrame(records))
+    except ValueError as e:
+        if len(records) == 1:
+            return [{"error": str(e)}]
+        return [score_records(disease, [record])[0] for record in records]
+    predictions, probabilities = batch_scoring.predict(disease, X)
+    return [
+        {"prediction": int(prediction), "probability": float(probability)}
+        for prediction, probability in zip(predictions, probabilities)
+    ]
+
+
+class MicroBatcher:
+    """Coalesces concurrent requests for one disease into batches of up to
+    max_batch records, waiting at most max_wait_ms after the first one."""
+
+    def __init__(self, disease, max_batch, max_wait_ms, executor):
+        self.disease = disease
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.executor = executor
+        self.queue = asyncio.Queue()
+        self.batches = 0
+        self.requests = 0
+
+    async def submit(self, record):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((record, future))
+        return await future
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        batch = [await self.queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch:
+            if not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            records = [record for record, _ in batch]
+            try:
+                results = await loop.run_in_executor(self.executor, score_records, self.disease, records)
+            except Exception as e:
+                results = None
+                error = e
+            self.batches += 1
+            self.requests += len(batch)
+            for i, (_, future) in enumerate(batch):
+                if future.done():
+                    continue
+                if results is None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(results[i])
+
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "mean_batch_size": self.requests / self.batches if self.batches else 0.0,
+        }
+
+
+class InferenceService:
+    def __init__(self, max_batch=DEFAULT_MAX_BATCH, max_wait_ms=DEFAULT_MAX_WAIT_MS):
+        self.max_batch = max_batch
+        self.max_wait_ms = max_wait_ms
+        self.executor = ThreadPoolExecutor(max_workers=len(model_registry.ARTIFACTS),
+                                           thread_name_prefix="biopredict-service")
+        self.batchers = {}
+        self._tasks = []
+
+    def start_batchers(self):
+        for disease in model_registry.ARTIFACTS:
+            batcher = MicroBatcher(disease, self.max_batch, self.max_wait_ms, self.executor)
+            self.batchers[disease] = batcher
+            self._tasks.append(asyncio.create_task(batcher.run()))
+
+    async def route(self, method, path, body):
+        parts = path.split("?", 1)[0].strip("/").split("/")
+        if parts == ["health"]:
+            return 200, {"status": "ok", "diseases": list(self.batchers)}
+        if parts == ["stats"]:
+            return 200, {disease: batcher.stats() for disease, batcher in self.batchers.items()}
+        if len(parts) != 2 or parts[0] != "predict":
+            return 404, {"error": f"No route for {path}"}
+        if parts[1] not in self.batchers:
+            return 404, {"error": f"Unknown disease '{parts[1]}'. Expected one of: {', '.join(self.batchers)}"}
+        if method != "POST":
+            return 405, {"error": "Use POST with one patient as a JSON object."}
+
+        try:
+            record = json.loads(body or b"null")
+        except ValueError as e:
+            return 400, {"error": f"Invalid JSON: {e}"}
+        if not isinstance(record, dict):
+            return 400, {"error": "The body must be one patient as a JSON object."}
+
+        # Invalid records come back as {"error": ...} results; anything
+        # raised is the server's own failure.
+        try:
+            result = await self.batchers[parts[1]].submit(record)
+        except Exception as e:
+            return 500, {"error": f"Scoring failed: {e}"}
+        return (400 if "error" in result else 200), result
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "Malformed request line"}, keep_alive=False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = headers.get("content-length", "0")
+                if not (length.isascii() and length.isdigit()):
+                    await self._respond(writer, 400, {"error": f"Invalid Content-Length: {length!r}"},
+                                        keep_alive=False)
+                    break
+                length = int(length)
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {"error": "Request body too large"}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" and (version == "HTTP/1.1" or connection == "keep-alive")
+                status, payload = await self.route(method.upper(), path, body)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+    async def serve(self, host, port):
+        self.start_batchers()
+        server = await asyncio.start_server(self.handle, host, port)
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve BioPredict's models over HTTP with micro-batching.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH,
+                        help=f"most requests scored in one call (default: {DEFAULT_MAX_BATCH})")
+    parser.add_argument("--max-wait-ms", type=float, default=DEFAULT_MAX_WAIT_MS,
+                        help=f"longest a request waits for others to join its batch (default: {DEFAULT_MAX_WAIT_MS})")
+    args = parser.parse_args(argv)
+
+    if args.max_batch < 1:
+        parser.error("--max-batch must be at least 1")
+    if args.max_wait_ms < 0:
+        parser.error("--max-wait-ms must be 0 or more")
+
+    for disease in model_registry.ARTIFACTS:
+        model_registry.load(disease)
+
+    service = InferenceService(args.max_batch, args.max_wait_ms)
+    print(f"Serving /predict/{{{'|'.join(model_registry.ARTIFACTS)}}} on http://{args.host}:{args.port} "
+          f"(max batch {args.max_batch}, max wait {args.max_wait_ms} ms)", flush=True)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
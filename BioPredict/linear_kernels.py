@@ -0,0 +1,122 @@
+import numpy as np
+
+from feature_matrix import as_matrix
+
+# libsvm clips each pairwise probability to [MIN_PROB, 1 - MIN_PROB].
+MIN_PROB = 1e-7
+
+
+class CompiledLinearSVC:
+    """StandardScaler + linear SVC folded into one weight vector.
+
+    Predictions and Platt-scaled probabilities both come from the same
+    decision values, computed on raw (unscaled) features.
+    """
+
+    def __init__(self, weights, intercept, prob_a, prob_b, classes, feature_names=None):
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.intercept = float(intercept)
+        self.prob_a = float(prob_a)
+        self.prob_b = float(prob_b)
+        self.classes = np.asarray(classes)
+        self.feature_names = list(feature_names) if feature_names is not None else None
+
+    @classmethod
+    def from_sklearn(cls, model, scaler, feature_names=None):
+        if model.kernel != "linear" or len(model.classes_) != 2:
+            raise ValueError("Only binary SVC(kernel='linear') models can be compiled.")
+        if not model.probability:
+            raise ValueError("The SVC was trained without probability=True.")
+
+        coef = model.coef_[0]
+        mean = scaler.mean_ if scaler.with_mean else np.zeros_like(coef)
+        scale = scaler.scale_ if scaler.with_std else np.ones_like(coef)
+        # w . (x - mean) / scale + b  ==  (w / scale) . x + (b - w . mean / scale)
+        weights = coef / scale
+        intercept = model.intercept_[0] - np.dot(coef, mean / scale)
+        return cls(weights, intercept, model.probA_[0], model.probB_[0], model.classes_, feature_names)
+
+    def decision_function(self, X):
+        # Not X @ weights: BLAS picks its summation order by batch size, so a
+        # row's score would change in the last bit with how rows are chunked
+        # or sharded. Each row is summed the same way on a C-ordered product.
+        X = np.ascontiguousarray(as_matrix(X, self.feature_names, np.float64))
+        return (X * self.weights).sum(axis=1) + self.intercept
+
+    def score(self, X):
+        decision = self.decision_function(X)
+        predictions = self.classes[(decision >= 0).astype(int)]
+        return predictions, _platt_probabilities(decision, self.prob_a, self.prob_b)
+
+    def predict(self, X):
+        return self.score(X)[0]
+
+    def predict_proba(self, X):
+        return self.score(X)[1]
+
+
+def _platt_probabilities(decision, prob_a, prob_b):
+    # libsvm's decision value for the first class is the negated sklearn one.
+    f = -decision * prob_a + prob_b
+    e = np.exp(-np.abs(f))
+    first = np.where(f >= 0, e / (1 + e), 1 / (1 + e))
+    first = np.clip(first, MIN_PROB, 1 - MIN_PROB)
+    return _couple_pairwise(first)
+
+
+def _couple_pairwise(r01):
+    # libsvm's multiclass_probability for two classes. It does not return r01
+    # directly but iterates until max|Qp - pQp| < eps, so it is replayed here,
+    # row-wise, to match sklearn's predict_proba.
+    r10 = 1 - r01
+    Q = ((r10 * r10, -r10 * r01), (-r10 * r01, r01 * r01))
+    p = [np.full_like(r01, 0.5), np.full_like(r01, 0.5)]
+    active = np.ones(r01.shape, dtype=bool)
+    eps = 0.005 / 2
+
+    for _ in range(100):
+        Qp = [Q[t][0] * p[0] + Q[t][1] * p[1] for t in (0, 1)]
+        pQp = p[0] * Qp[0] + p[1] * Qp[1]
+        error = np.maximum(np.abs(Qp[0] - pQp), np.abs(Qp[1] - pQp))
+        active &= error >= eps
+        if not active.any():
+            break
+        for t in (0, 1):
+            diff = np.where(active, (-Qp[t] + pQp) / Q[t][t], 0.0)
+            p[t] = p[t] + diff
+            pQp = (pQp + diff * (diff * Q[t][t] + 2 * Qp[t])) / (1 + diff) / (1 + diff)
+            Qp = [(Qp[j] + diff * Q[t][j]) / (1 + diff) for j in (0, 1)]
+            p = [p[j] / (1 + diff) for j in (0, 1)]
+
+    return np.column_stack(p)
+
+
+def sklearn_score(model, scaler, X):
+    """The scaler and SVC as sklearn runs them: what CompiledLinearSVC
+    must reproduce."""
+    scaled = scaler.transform(X)
+    return model.predict(scaled), model.predict_proba(scaled)
+
+
+if __name__ == "__main__":
+    import warnings
+
+    import pandas as pd
+
+    import batch_scoring
+    import model_registry
+    from timing import best_ms
+
+    warnings.filterwarnings("ignore")
+
+    artifacts = model_registry.load("diabetes")
+    model, scaler, kernel = artifacts["model"], artifacts["scaler"], artifacts["kernel"]
+    raw = pd.read_csv(model_registry.ARTIFACT_DIR / "diabetes.csv")[batch_scoring.DIABETES_COLUMNS].astype(float)
+    row = raw.iloc[[0]]
+
+    # Equivalence with sklearn is checked by tests/test_linear_kernels.py.
+    print(f"diabetes: {len(raw)} rows")
+    print(f"  1 row     sklearn {best_ms(lambda: sklearn_score(model, scaler, row), 200):7.3f} ms"
+          f"   compiled {best_ms(lambda: kernel.score(row), 200):7.3f} ms")
+    print(f"  {len(raw)} rows  sklearn {best_ms(lambda: sklearn_score(model, scaler, raw), 20):7.3f} ms"
+          f"   compiled {best_ms(lambda: kernel.score(raw), 20):7.3f} ms")
@@ -0,0 +1,153 @@
+import threading
+from pathlib import Path
+
+import artifact_bundle
+
+ARTIFACT_DIR = Path(__file__).resolve().parent
+
+# Every live artifact packed into one file by `python artifact_bundle.py
+# build`, which the dev container runs on setup; the file is not committed.
+# Used instead of the files below while it matches them and the kernel code.
+BUNDLE_PATH = ARTIFACT_DIR / "biopredict.bundle"
+# Built by _load from the files below. Their arrays are only read, so the
+# bundle maps them straight from the page cache.
+COMPILED_ARTIFACTS = ("pipeline", "kernel", "forest", "codes")
+# The code that builds them. A bundle built by other versions of these
+# modules is not used, since its pickled objects would not match the code.
+KERNEL_MODULES = ("heart_kernels.py", "linear_kernels.py", "thyroid_kernels.py", "tree_kernels.py")
+
+# Every live artifact of the five disease pages. Loaded once per process and
+# shared by all pages and sessions; reloaded only when a file's mtime changes.
+ARTIFACTS = {
+    "heart": {
+        "bundle": "heart_model.pkl",
+    },
+    "diabetes": {
+        "model": "diabetes_classifier.pkl",
+        "scaler": "diabetes_scaler.pkl",
+        "feature_names": "diabetes_feature_names.pkl",
+    },
+    "parkinson": {
+        "model": "parkinson_model.pkl",
+        "scaler": "parkinson_scaler.pkl",
+        "feature_names": "parkinson_feature_names.pkl",
+    },
+    "thyroid": {
+        "model": "xgb_model.pkl",
+        "scaler": "thyroid_scaler.pkl",
+        "category_mappings": "category_mappings.pkl",
+    },
+    "alzheimer": {
+        "model": "alzheimers_model.pkl",
+        "scalers": "scalers.joblib",
+        "feature_names": "alzheimers_feature_names.pkl",
+    },
+}
+
+OPTIONAL_ARTIFACTS = {("alzheimer", "scalers")}
+
+# The bundled training data, one file per disease, in the columns
+# batch_scoring.prepare expects.
+SAMPLE_DATA = {
+    "heart": "heart.csv",
+    "diabetes": "diabetes.csv",
+    "parkinson": "parkinsons.data",
+    "thyroid": "Thyroid_Diff.csv",
+    "alzheimer": "alzheimers_disease_data.csv",
+}
+
+_cache = {}
+_locks = {disease: threading.Lock() for disease in ARTIFACTS}
+
+
+def artifact_paths(disease):
+    return {name: ARTIFACT_DIR / filename for name, filename in ARTIFACTS[disease].items()}
+
+
+def kernel_paths():
+    return {Path(filename).stem: ARTIFACT_DIR / filename for filename in KERNEL_MODULES}
+
+
+def model_version(disease):
+    return tuple(
+        path.stat().st_mtime if path.exists() else None
+        for path in [*artifact_paths(disease).values(), BUNDLE_PATH]
+    )
+
+
+def _load_artifact(disease, name, path):
+    import joblib
+
+    if (disease, name) not in OPTIONAL_ARTIFACTS:
+        return joblib.load(path)
+    if not path.exists():
+        return None
+    try:
+        return joblib.load(path)
+    except Exception:
+        return None
+
+
+def load_from_files(disease):
+    # Imported here so importing the registry stays cheap for pages that
+    # have not predicted yet.
+    from heart_kernels import CompiledHeartPipeline
+    from linear_kernels import CompiledLinearSVC
+    from thyroid_kernels import ThyroidCodeTables
+    from tree_kernels import CompiledForest
+
+    artifacts = {}
+    for name, path in artifact_paths(disease).items():
+        artifacts[name] = _load_artifact(disease, name, path)
+
+    if disease == "heart":
+        artifacts.update(artifacts.pop("bundle"))
+        artifacts["pipeline"] = CompiledHeartPipeline.from_bundle(artifacts)
+
+    if artifacts.get("feature_names") is not None:
+        artifacts["feature_names"] = list(artifacts["feature_names"])
+
+    if disease == "diabetes":
+        artifacts["kernel"] = CompiledLinearSVC.from_sklearn(
+            artifacts["model"], artifacts["scaler"], artifacts["feature_names"]
+        )
+
+    # XGBoost models are also flattened into NumPy arrays, which score a
+    # single row several times faster than building a DMatrix.
+    if hasattr(artifacts.get("model"), "get_booster"):
+        artifacts["forest"] = CompiledForest.from_xgboost(artifacts["model"])
+
+    if disease == "thyroid":
+        artifacts["codes"] = ThyroidCodeTables.from_artifacts(
+            artifacts["category_mappings"], artifacts["scaler"], artifacts["forest"].feature_names
+        )
+
+    return artifacts
+
+
+def _load(disease):
+    # A stale or damaged bundle is skipped rather than trusted. Staleness is
+    # judged from the files' size and mtime, so no source file is read; each
+    # entry's checksum is computed once per opened bundle.
+    bundle = artifact_bundle.open_bundle(BUNDLE_PATH)
+    if (bundle is not None and bundle.matches_sources(disease, artifact_paths(disease))
+            and bundle.matches_code(kernel_paths()) and bundle.verify_disease(disease)):
+        return bundle.artifacts(disease)
+    return load_from_files(disease)
+
+
+def load(disease):
+    if disease not in ARTIFACTS:
+        raise KeyError(f"Unknown disease '{disease}'. Expected one of: {', '.join(ARTIFACTS)}")
+
+    version = model_version(disease)
+    cached = _cache.get(disease)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    with _locks[disease]:
+        cached = _cache.get(disease)
+        if cached is None or cached[0] != version:
+            cached = (version, _load(disease))
+            _cache[disease] = cached
+    return cached[1]
@@ -0,0 +1,129 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+import batch_scoring
+import model_registry
+
+# Set BIOPREDICT_CACHE_SIZE (rows kept) and BIOPREDICT_CACHE_TTL (seconds a
+# row is kept) to size the shared cache; both are read once at import.
+DEFAULT_MAX_SIZE = int(os.environ.get("BIOPREDICT_CACHE_SIZE", 10_000))
+DEFAULT_TTL_SECONDS = float(os.environ.get("BIOPREDICT_CACHE_TTL", 60 * 60))
+
+
+class PredictionCache:
+    """Bounded, thread-safe LRU of per-row predictions with TTL expiry.
+
+    Keys are (disease, model version, encoded row bytes). The model version
+    is the artifacts' mtimes, so retraining a model never serves old scores.
+    """
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, ttl_seconds=DEFAULT_TTL_SECONDS, clock=time.monotonic):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def configure(self, max_size=None, ttl_seconds=None):
+        with self._lock:
+            if max_size is not None:
+                self.max_size = max_size
+            if ttl_seconds is not None:
+                self.ttl_seconds = ttl_seconds
+            self._evict()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= self.clock():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (self.clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def check_version(self, disease, version):
+        # Drop a disease's entries as soon as its artifacts change on disk;
+        # they could never be hit again and would only crowd out live ones.
+        with self._lock:
+            if self._versions.get(disease, version) != version:
+                for key in [key for key in self._entries if key[0] == disease]:
+                    del self._entries[key]
+            self._versions[disease] = version
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def _evict(self):
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+
+cache = PredictionCache()
+
+
+def canonical_rows(disease, X):
+    """The encoded feature matrix the cache keys on, one row per patient."""
+    if isinstance(X, pd.DataFrame):
+        X = X[model_registry.load(disease)["feature_names"]].to_numpy(dtype=np.float64)
+    return np.ascontiguousarray(np.atleast_2d(X))
+
+
+def predict(disease, X):
+    """batch_scoring.predict for interactive use, answered from the cache
+    where possible. X must already be encoded and scaled the way the page
+    passes it to batch_scoring.predict."""
+    X = canonical_rows(disease, X)
+    version = model_registry.model_version(disease)
+    cache.check_version(disease, version)
+
+    keys = [(disease, version, X.dtype.str, row.tobytes()) for row in X]
+    results = [cache.get(key) for key in keys]
+    missing = [i for i, result in enumerate(results) if result is None]
+    if missing:
+        predictions, probabilities = batch_scoring.predict(disease, X[missing])
+        for i, prediction, probability in zip(missing, predictions, probabilities):
+            results[i] = (prediction, probability)
+            cache.put(keys[i], results[i])
+
+    predictions, probabilities = zip(*results)
+    return np.asarray(predictions), np.asarray(probabilities)
@@ -0,0 +1,48 @@
+import streamlit as st
+
+import report_store
+
+BLUE = ("#4C6EF5", "#15AABF")
+PURPLE = ("#8E24AA", "#CE93D8")
+
+
+def render_report_download(report_id, file_name, label, colors=BLUE):
+    """The saved report's download button. The page only carries the
+    button; the report is rendered from the store when it is clicked and
+    served once from Streamlit's media endpoint."""
+    key = "report_download"
+    st.markdown(f"""
+        <style>
+        .st-key-{key} {{
+            display: flex;
+            justify-content: center;
+            margin-top: 40px;
+            animation: fadeIn 3s;
+        }}
+        .st-key-{key} button {{
+            background: linear-gradient(90deg, {colors[0]}, {colors[1]});
+            color: white;
+            padding: 14px 30px;
+            border: none;
+            border-radius: 12px;
+            box-shadow: 3px 3px 10px rgba(0,0,0,0.2);
+            transition: 0.3s;
+        }}
+        .st-key-{key} button p {{
+            font-size: 18px;
+            font-weight: bold;
+        }}
+        @keyframes fadeIn {{
+            from {{ opacity: 0; transform: translateY(10px); }}
+            to {{ opacity: 1; transform: translateY(0); }}
+        }}
+        </style>
+    """, unsafe_allow_html=True)
+    st.download_button(
+        label,
+        data=lambda: report_store.store.html(report_id).encode("utf-8"),
+        file_name=file_name,
+        mime="text/html",
+        on_click="ignore",
+        key=key,
+    )
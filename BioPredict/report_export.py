@@ -0,0 +1,93 @@
+import csv
+import io
+import sys
+import zipfile
+
+import report_store
+import report_templates
+
+INDEX_FILE = "index.csv"
+INDEX_COLUMNS = ["file", "id", "disease_type", "created_at", "patient_name", "age", "gender",
+                 "prediction", "probability"]
+
+
+class _Chunks(io.RawIOBase):
+    """A write-only, unseekable sink that hands back what was written since
+    the last drain(). zipfile writes to it with data descriptors."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _file_name(row):
+    slug = row["disease_type"].lower().replace(" ", "_")
+    return f"{row['created_at'][:10]}_{slug}_{row['id']}.html"
+
+
+def iter_zip(store, session_id, disease_type=None):
+    """A zip archive of the session's reports, yielded in chunks as it is
+    written: index.csv, the shared stylesheet once, then one HTML file per
+    report, each linking to that stylesheet. Reports are read and rendered
+    one at a time, so a consumer that writes each chunk out as it comes,
+    like main(), holds about one report plus zipfile's directory entry of
+    about 1 KB per report, whatever the count."""
+    sink = _Chunks()
+    with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as archive:
+        with archive.open(INDEX_FILE, "w", force_zip64=True) as f:
+            index = io.TextIOWrapper(f, encoding="utf-8", newline="")
+            writer = csv.writer(index)
+            writer.writerow(INDEX_COLUMNS)
+            for row in store.iter_reports(session_id, disease_type):
+                writer.writerow([_file_name(row)] + [row[column] for column in INDEX_COLUMNS[1:]])
+                yield sink.drain()
+            index.detach()
+        yield sink.drain()
+
+        archive.writestr(report_templates.STYLESHEET_FILE, report_templates.STYLESHEET)
+        for row in store.iter_reports(session_id, disease_type, bodies=True):
+            record = report_store.ReportRecord(*(row[name] for name in report_store.RECORD_FIELDS))
+            archive.writestr(_file_name(row), report_templates.render(store.result(record), linked=True))
+            yield sink.drain()
+    yield sink.drain()
+
+
+def zip_bytes(store, session_id, disease_type=None):
+    """The finished archive as one bytes object, for st.download_button,
+    whose media storage only takes whole files. Memory is therefore NOT
+    bounded by one report: the whole compressed archive, about 0.9 KB per
+    report, is held until the download is served. The rendered reports
+    still go through one at a time. Use iter_zip() where the output can be
+    streamed."""
+    return b"".join(iter_zip(store, session_id, disease_type))
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export saved reports as one zip archive.")
+    parser.add_argument("output", help="archive to write, or - for stdout")
+    parser.add_argument("--session", required=True, help="reports saved by this browser session")
+    parser.add_argument("--disease", help="only reports of this disease type, e.g. 'Heart Disease'")
+    args = parser.parse_args(argv)
+
+    out = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    with out:
+        for chunk in iter_zip(report_store.store, args.session, args.disease):
+            out.write(chunk)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
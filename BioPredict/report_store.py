@@ -0,0 +1,358 @@
+import hashlib
+import os
+import queue
+import sqlite3
+import threading
+import uuid
+from array import array
+from contextlib import contextmanager
+from dataclasses import dataclass, fields
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import report_templates
+
+DEFAULT_PATH = Path(os.environ.get("BIOPREDICT_REPORTS_DB", Path(__file__).resolve().parent / "reports.db"))
+DEFAULT_POOL_SIZE = 4
+DEFAULT_PAGE_SIZE = 10
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+SCHEMA_VERSION = 1
+GRANULARITIES = ("day", "week")
+
+# A report is stored as its result, not its HTML: the outcome, the patient
+# fields, and its status and advice texts as ids into the texts table.
+# statuses packs each status as text id << 2 | index in STATUS_CLASSES and
+# advice packs the advice text ids, both as arrays of uint32. reports_fts
+# indexes each report's patient name and its status and advice texts under
+# the report's id, and keeps no copy of the text. Its owner column holds
+# one opaque token each for the report's session and disease type, so a
+# search intersects with the session's reports inside the full-text index
+# instead of matching across every report first. risk_buckets keeps
+# running totals per owner (the session's token), disease type and day or
+# week (starting on Monday), updated with each new report, so a risk
+# timeline reads one row per bucket.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    user_name TEXT NOT NULL,
+    disease_type TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    prediction INTEGER,
+    probability REAL,
+    patient_name TEXT,
+    age NUMERIC,
+    gender TEXT,
+    statuses BLOB,
+    advice BLOB
+);
+CREATE TABLE IF NOT EXISTS texts (
+    id INTEGER PRIMARY KEY,
+    text TEXT NOT NULL UNIQUE
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS reports_fts USING fts5(owner, patient_name, body, content='');
+CREATE INDEX IF NOT EXISTS reports_session_id ON reports (session_id, disease_type, created_at);
+CREATE INDEX IF NOT EXISTS reports_disease_type ON reports (disease_type, created_at);
+CREATE INDEX IF NOT EXISTS reports_created_at ON reports (created_at);
+CREATE TABLE IF NOT EXISTS risk_buckets (
+    owner TEXT NOT NULL,
+    disease_type TEXT NOT NULL,
+    granularity TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    reports INTEGER NOT NULL,
+    positives INTEGER NOT NULL,
+    probability_sum REAL NOT NULL,
+    probability_min REAL NOT NULL,
+    probability_max REAL NOT NULL,
+    PRIMARY KEY (owner, granularity, disease_type, bucket)
+) WITHOUT ROWID;
+"""
+
+
+def new_session_id():
+    return uuid.uuid4().hex
+
+
+def _token(kind, value):
+    return kind + hashlib.blake2b(value.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _timestamp(day, time_of_day):
+    return f"{day.isoformat() if isinstance(day, date) else day} {time_of_day}"
+
+
+@dataclass(slots=True)
+class ReportRecord:
+    """One saved report as stored. The texts are ids until the store
+    resolves them, which it does only to render."""
+
+    id: int
+    disease_type: str
+    created_at: str
+    prediction: int
+    probability: float
+    patient_name: str
+    age: object
+    gender: str
+    statuses: bytes
+    advice: bytes
+
+
+RECORD_FIELDS = tuple(f.name for f in fields(ReportRecord))
+RECORD_COLUMNS = ", ".join(RECORD_FIELDS)
+
+
+class ReportStore:
+    """Saved reports in a local SQLite file, shared by every session.
+
+    Runs in WAL mode so report lists keep reading while another session
+    saves. Connections are pooled and handed to one thread at a time.
+    Reports belong to the browser session that saved them. The user name
+    typed in is kept only to show; anyone can type any name, so it never
+    decides who can read a report.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, pool_size=DEFAULT_POOL_SIZE):
+        self.path = Path(path)
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+        # Text ids never change once committed, so both directions are
+        # cached for the life of the process. Ids a transaction assigns are
+        # only shared once it commits.
+        self._text_lock = threading.Lock()
+        self._text_ids = {}
+        self._texts = {}
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with self._schema_lock:
+            if not self._schema_ready:
+                conn.executescript(f"BEGIN; {SCHEMA} PRAGMA user_version = {SCHEMA_VERSION}; COMMIT;")
+                self._schema_ready = True
+        return conn
+
+    @contextmanager
+    def connection(self):
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        try:
+            yield conn
+        finally:
+            try:
+                self._pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    def close(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def _text_id(self, conn, text, pending):
+        with self._text_lock:
+            text_id = self._text_ids.get(text)
+        if text_id is None:
+            text_id = pending.get(text)
+        if text_id is None:
+            conn.execute("INSERT OR IGNORE INTO texts (text) VALUES (?)", (text,))
+            text_id = pending[text] = conn.execute("SELECT id FROM texts WHERE text = ?", (text,)).fetchone()[0]
+        return text_id
+
+    def _text(self, conn, text_id):
+        with self._text_lock:
+            text = self._texts.get(text_id)
+        if text is None:
+            text = conn.execute("SELECT text FROM texts WHERE id = ?", (text_id,)).fetchone()[0]
+            with self._text_lock:
+                self._texts[text_id] = text
+        return text
+
+    def add(self, session_id, user_name, result, created_at=None):
+        """Save a report_templates.ReportResult for session_id. user_name
+        is shown with it and is empty when none was given."""
+        created_at = created_at or datetime.now().strftime(TIMESTAMP_FORMAT)
+        status_codes = {css: code for code, css in enumerate(report_templates.STATUS_CLASSES)}
+        pending = {}
+        with self.connection() as conn:
+            conn.execute("BEGIN")
+            try:
+                statuses = array("I", (self._text_id(conn, comment, pending) << 2 | status_codes[css]
+                                       for css, comment in result.statuses))
+                advice = array("I", (self._text_id(conn, item, pending) for item in result.advice))
+                age = result.age.item() if hasattr(result.age, "item") else result.age
+                cursor = conn.execute(
+                    "INSERT INTO reports (session_id, user_name, disease_type, created_at, prediction, probability, "
+                    "patient_name, age, gender, statuses, advice) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (session_id, user_name, report_templates.REPORTS[result.disease]["name"], created_at,
+                     int(result.prediction), float(result.probability), result.user_name, age, result.gender,
+                     statuses.tobytes(), advice.tobytes()),
+                )
+                self._index(conn, cursor.lastrowid, session_id, report_templates.REPORTS[result.disease]["name"],
+                            result.user_name,
+                            [comment for _, comment in result.statuses] + list(result.advice))
+                self._aggregate(conn, session_id, report_templates.REPORTS[result.disease]["name"], created_at, int(result.prediction), float(result.probability))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        if pending:
+            with self._text_lock:
+                self._text_ids.update(pending)
+        return cursor.lastrowid
+
+    @staticmethod
+    def _index(conn, report_id, session_id, disease_type, patient_name, texts):
+        owner = f"{_token('s', session_id)} {_token('d', disease_type)}"
+        conn.execute("INSERT INTO reports_fts (rowid, owner, patient_name, body) VALUES (?, ?, ?, ?)",
+                     (report_id, owner, patient_name or "", "\n".join(texts)))
+
+    @staticmethod
+    def _aggregate(conn, session_id, disease_type, created_at, prediction, probability):
+        day = date.fromisoformat(created_at[:10])
+        buckets = {"day": day, "week": day - timedelta(days=day.weekday())}
+        conn.executemany(
+            "INSERT INTO risk_buckets (owner, disease_type, granularity, bucket, reports, positives, "
+            "probability_sum, probability_min, probability_max) VALUES (?, ?, ?, ?, 1, ?, ?, ?, ?) "
+            "ON CONFLICT (owner, granularity, disease_type, bucket) DO UPDATE SET "
+            "reports = reports + 1, positives = positives + excluded.positives, "
+            "probability_sum = probability_sum + excluded.probability_sum, "
+            "probability_min = min(probability_min, excluded.probability_min), "
+            "probability_max = max(probability_max, excluded.probability_max)",
+            [(_token("s", session_id), disease_type, granularity, bucket.isoformat(), prediction, probability,
+              probability, probability)
+             for granularity, bucket in buckets.items()],
+        )
+
+    @staticmethod
+    def _where(session_id, disease_type=None, query=None,
+               min_probability=None, max_probability=None, since=None, until=None):
+        clauses, params = ["session_id = ?"], [session_id]
+        if disease_type:
+            clauses.append("disease_type = ?")
+            params.append(disease_type)
+        if query and query.strip():
+            # Every word must match as a whole word; quoting keeps FTS5
+            # syntax characters in the input literal.
+            tokens = [_token("s", session_id)]
+            if disease_type:
+                tokens.append(_token("d", disease_type))
+            words = " ".join('"' + word.replace('"', '""') + '"' for word in query.split())
+            clauses.append("id IN (SELECT rowid FROM reports_fts WHERE reports_fts MATCH ?)")
+            params.append(f"owner : ({' '.join(tokens)}) AND {{patient_name body}} : ({words})")
+        if min_probability is not None:
+            clauses.append("probability >= ?")
+            params.append(min_probability)
+        if max_probability is not None:
+            clauses.append("probability <= ?")
+            params.append(max_probability)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(_timestamp(since, "00:00:00"))
+        if until is not None:
+            clauses.append("created_at <= ?")
+            params.append(_timestamp(until, "23:59:59"))
+        return " AND ".join(clauses), params
+
+    def disease_types(self, session_id):
+        with self.connection() as conn:
+            rows = conn.execute(
+                "SELECT DISTINCT disease_type FROM reports WHERE session_id = ? ORDER BY disease_type", (session_id,)
+            ).fetchall()
+        return [row["disease_type"] for row in rows]
+
+    def count(self, disease_type, session_id, **filters):
+        """How many of the session's reports of one type match the filters:
+        query (words in the patient name, statuses or advice),
+        min_probability / max_probability and since / until dates."""
+        where, params = self._where(session_id, disease_type, **filters)
+        with self.connection() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM reports WHERE {where}", params).fetchone()[0]
+
+    def page(self, disease_type, session_id, offset=0, limit=DEFAULT_PAGE_SIZE, **filters):
+        """One page of the session's reports of one type that match the
+        filters (see count()), oldest first. Metadata only; fetch a body
+        with html() when it is shown."""
+        where, params = self._where(session_id, disease_type, **filters)
+        with self.connection() as conn:
+            return conn.execute(
+                f"SELECT id, user_name, disease_type, created_at, probability FROM reports "
+                f"WHERE {where} ORDER BY created_at, id LIMIT ? OFFSET ?",
+                params + [limit, offset],
+            ).fetchall()
+
+    def timeline(self, session_id, granularity="week", disease_type=None, since=None):
+        """The session's risk per day or week, oldest first: one row per
+        disease type and bucket with its report count, positives and mean,
+        lowest and highest probability. Read from the running totals, so
+        the cost follows the number of buckets, not of reports."""
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"granularity must be one of {GRANULARITIES}, not {granularity!r}")
+        clauses, params = ["owner = ?", "granularity = ?"], [_token("s", session_id), granularity]
+        if disease_type:
+            clauses.append("disease_type = ?")
+            params.append(disease_type)
+        if since is not None:
+            clauses.append("bucket >= ?")
+            params.append(since.isoformat() if isinstance(since, date) else since)
+        with self.connection() as conn:
+            return conn.execute(
+                f"SELECT disease_type, bucket, reports, positives, probability_sum / reports AS probability_mean, "
+                f"probability_min, probability_max FROM risk_buckets WHERE {' AND '.join(clauses)} "
+                f"ORDER BY disease_type, bucket",
+                params,
+            ).fetchall()
+
+    def iter_reports(self, session_id, disease_type=None, bodies=False):
+        """Every report of the session, or of one type, oldest first. Rows are
+        fetched in small batches as they are consumed, so the whole set is
+        never in memory. With bodies=True rows also carry the stored record."""
+        where, params = "session_id = ?", [session_id]
+        if disease_type:
+            where += " AND disease_type = ?"
+            params.append(disease_type)
+        columns = "*" if bodies else \
+            "id, user_name, disease_type, created_at, prediction, probability, patient_name, age, gender"
+        with self.connection() as conn:
+            cursor = conn.execute(f"SELECT {columns} FROM reports WHERE {where} ORDER BY created_at, id", params)
+            while rows := cursor.fetchmany(100):
+                yield from rows
+
+    def record(self, report_id):
+        with self.connection() as conn:
+            row = conn.execute(
+                f"SELECT {RECORD_COLUMNS} FROM reports WHERE id = ?", (report_id,)
+            ).fetchone()
+        return ReportRecord(*row) if row is not None else None
+
+    def result(self, record):
+        """The ReportResult a record was saved from."""
+        codes = array("I", record.statuses)
+        with self.connection() as conn:
+            return report_templates.ReportResult(
+                disease=report_templates.DISEASES_BY_NAME[record.disease_type],
+                prediction=record.prediction,
+                probability=record.probability,
+                statuses=[(report_templates.STATUS_CLASSES[code & 3], self._text(conn, code >> 2)) for code in codes],
+                advice=[self._text(conn, text_id) for text_id in array("I", record.advice)],
+                user_name=record.patient_name,
+                age=record.age,
+                gender=record.gender,
+            )
+
+    def html(self, report_id):
+        """The report rendered from its record; None if there is no such
+        report."""
+        record = self.record(report_id)
+        return report_templates.render(self.result(record)) if record is not None else None
+
+
+store = ReportStore()
@@ -0,0 +1,302 @@
+import string
+from dataclasses import dataclass, field
+from html import escape
+
+# One stylesheet for every report. The verdict colour comes from the body's
+# class, so the stylesheet itself never changes between reports. Archives of
+# many reports ship it once as STYLESHEET_FILE and link to it.
+STYLESHEET_FILE = "report.css"
+STYLESHEET = """
+body {
+    font-family: Arial, sans-serif;
+    line-height: 1.6;
+    padding: 20px;
+    display: flex;
+    flex-direction: column;
+    justify-content: center;
+    align-items: center;
+    min-height: 100vh;
+    text-align: center;
+}
+h2 {
+    color: #2E86C1;
+}
+.negative h3 { color: green; }
+.positive h3 { color: red; }
+.section {
+    margin-bottom: 20px;
+    width: 100%;
+    max-width: 600px;
+}
+.section ul {
+    list-style-position: inside;
+    padding: 0;
+    margin: 0 auto;
+    display: inline-block;
+    text-align: left;
+}
+.section p {
+    margin: 0;
+    padding: 0;
+}
+.success { color: green; }
+.warning { color: orange; }
+.error { color: red; }
+ul {
+    list-style-type: none;
+    padding: 0;
+    text-align: left;
+}
+li {
+    margin-bottom: 10px;
+}
+"""
+
+DOCUMENT = """<html>
+<head>
+<meta charset="utf-8">
+{style}
+</head>
+<body class="{outcome}">
+<h2>{title}</h2>
+<h3>{verdict}</h3>
+
+<div class="section">
+{patient}
+</div>
+
+<h3>Health Status</h3>
+<ul>
+{statuses}
+</ul>
+
+<div class="section">
+<h3 style="margin:0; padding:0;">{advice_title}</h3>
+<ul>
+{advice}
+</ul>
+</div>
+
+<h3>{general_title}</h3>
+<ul>
+{general}
+</ul>
+</body>
+</html>
+"""
+
+# The fixed text of each disease's report; "name" is its disease_type in the
+# report store.
+REPORTS = {
+    "heart": {
+        "name": "Heart Disease",
+        "title": "📝 Heart Health Report 📝",
+        "verdicts": ("✅ No Heart Disease ✅", "⚠️ Heart Disease Detected ⚠️"),
+        "general_title": "General Health Recommendations",
+        "general": [
+            "Maintaining a healthy diet and engaging in regular physical activity are crucial for heart health.",
+            "Avoid smoking and alcohol consumption.",
+            "Have regular medical check-ups.",
+            "Monitor your blood pressure and cholesterol levels consistently.",
+            "If you experience any symptoms or discomfort, seek medical attention without delay.",
+            "Ensure you get adequate sleep and manage stress effectively to reduce heart strain.",
+            "Maintain a healthy weight, as obesity is a significant risk factor for heart disease.",
+        ],
+    },
+    "diabetes": {
+        "name": "Diabetes",
+        "title": "📝 Diabetes Report 📝",
+        "verdicts": ("✅ No Diabetes ✅", "⚠️ Diabetes Present ⚠️"),
+        "general_title": "General Health Recommendations",
+        "general": [
+            "Healthy eating and regular exercise are very important.",
+            "Limit smoking and alcohol consumption.",
+            "Monitor your blood sugar levels regularly.",
+            "Do not skip your annual health check-ups.",
+            "Maintain a healthy weight to reduce diabetes risk.",
+            "Manage stress through relaxation techniques or mindfulness.",
+        ],
+    },
+    "parkinson": {
+        "name": "Parkinson",
+        "title": "📝 Parkinson Report 📝",
+        "verdicts": ("✅ No Parkinson Disease Detected ✅", "⚠️ Parkinson Disease Detected ⚠️"),
+        "general_title": "General Health Recommendations",
+        "general": [
+            "Do not neglect regular neurological check-ups.",
+            "Stress management and a healthy lifestyle can reduce the risk of Parkinson's.",
+            "Participation in regular exercise and social activities is important.",
+            "Maintain a balanced diet rich in antioxidants and omega-3 fatty acids.",
+            "Ensure quality sleep to support brain health and overall well-being.",
+            "Avoid exposure to environmental toxins and harmful chemicals when possible.",
+            "Engage in cognitive activities such as reading, puzzles, or learning new skills to keep your mind active.",
+        ],
+    },
+    "thyroid": {
+        "name": "Thyroid Cancer",
+        "title": "Thyroid Cancer Prediction Report",
+        "verdicts": ("✅ No Thyroid Cancer ✅", "⚠️ Thyroid Cancer Detected ⚠️"),
+        "general_title": "General Health Advice",
+        "general": [
+            "Pay attention to a healthy and balanced diet.",
+            "Don't forget to drink enough water.",
+            "Try to avoid stress.",
+            "Make sure you get enough sleep.",
+            "Don't neglect regular exercise.",
+            "Limit smoking and alcohol consumption.",
+            "Don't skip your annual health check-ups.",
+            "Follow your doctor's recommendations.",
+            "Have regular check-ups to protect your thyroid health.",
+            "Practice stress management techniques.",
+            "Ensure adequate iodine intake.",
+            "Do not use medications that may affect your thyroid health without consulting your doctor.",
+        ],
+    },
+    "alzheimer": {
+        "name": "Alzheimer",
+        "title": "Alzheimer Risk Report",
+        "verdicts": ("✅ No Alzheimer ✅", "⚠️ Alzheimer Detected ⚠️"),
+        "general_title": "General Health Recommendations",
+        "general": [
+            "Do at least 150 minutes of moderate exercise per week.",
+            "Adopt healthy eating habits, such as the Mediterranean diet.",
+            "Have regular memory and cognitive function tests.",
+            "Keep your blood pressure and cholesterol under control.",
+            "Seek professional support for depression and anxiety.",
+            "Engage in social activities and mental exercises.",
+            "Get assistance if you need help with daily living activities.",
+            "Have regular check-ups to detect early signs of Alzheimer’s.",
+        ],
+    },
+}
+
+
+class Template:
+    """Text with {name} slots, split into literal and slot chunks once.
+    bind() folds fixed values into the literals; render() only fills the
+    remaining slots and joins."""
+
+    def __init__(self, source=None, chunks=None):
+        if chunks is None:
+            chunks = []
+            for literal, name, _, _ in string.Formatter().parse(source):
+                chunks.append(literal)
+                if name is not None:
+                    chunks.append((name,))
+        merged = []
+        for chunk in chunks:
+            if isinstance(chunk, str) and merged and isinstance(merged[-1], str):
+                merged[-1] += chunk
+            elif chunk != "":
+                merged.append(chunk)
+        self._chunks = merged
+        self._parts = [chunk if isinstance(chunk, str) else "" for chunk in merged]
+        self._slots = [(i, chunk[0]) for i, chunk in enumerate(merged) if not isinstance(chunk, str)]
+        self.fields = frozenset(name for _, name in self._slots)
+
+    def bind(self, **values):
+        return Template(chunks=[
+            values[chunk[0]] if not isinstance(chunk, str) and chunk[0] in values else chunk
+            for chunk in self._chunks
+        ])
+
+    def render(self, **values):
+        parts = self._parts.copy()
+        for i, name in self._slots:
+            parts[i] = values[name]
+        return "".join(parts)
+
+
+def _items(texts):
+    return "\n".join(f"<li>{text}</li>" for text in texts)
+
+
+def _compile(disease, style):
+    report = REPORTS[disease]
+    document = Template(DOCUMENT).bind(
+        style=style,
+        title=report["title"],
+        general_title=report["general_title"],
+        general=_items(report["general"]),
+    )
+    return tuple(
+        document.bind(outcome=outcome, verdict=verdict)
+        for outcome, verdict in zip(("negative", "positive"), report["verdicts"])
+    )
+
+
+# disease -> (template for prediction 0, template for prediction 1)
+TEMPLATES = {disease: _compile(disease, f"<style>{STYLESHEET}</style>") for disease in REPORTS}
+LINKED_TEMPLATES = {
+    disease: _compile(disease, f'<link rel="stylesheet" href="{STYLESHEET_FILE}">') for disease in REPORTS
+}
+DISEASES_BY_NAME = {report["name"]: disease for disease, report in REPORTS.items()}
+STATUS_CLASSES = ("success", "warning", "error")
+
+
+@dataclass(slots=True)
+class ReportResult:
+    """What a page knows after one prediction: the outcome, one
+    (status class, comment) pair per checked feature, and the advice."""
+
+    disease: str
+    prediction: int
+    probability: float
+    statuses: list = field(default_factory=list)
+    advice: list = field(default_factory=list)
+    user_name: str = ""
+    age: object = None
+    gender: str = ""
+
+
+def _patient(result):
+    rows = [("Name", result.user_name), ("Age", result.age), ("Gender", result.gender)]
+    return "\n".join(
+        f"<p><b>{label}:</b> {escape(str(value))}</p>"
+        for label, value in rows
+        if value not in (None, "", "Select")
+    )
+
+
+def render(result, linked=False):
+    """The standalone HTML report for one result, or with linked=True one
+    that loads the stylesheet from STYLESHEET_FILE beside it."""
+    name = escape(result.user_name) if result.user_name else ""
+    templates = LINKED_TEMPLATES if linked else TEMPLATES
+    return templates[result.disease][int(result.prediction)].render(
+        patient=_patient(result),
+        statuses="\n".join(f'<li><span class="{css}">{comment}</span></li>' for css, comment in result.statuses),
+        advice_title=f"Personalized Recommendations for {name}" if name else "Personalized Recommendations",
+        advice=_items(result.advice),
+    )
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    rng = random.Random(0)
+    classes = ("success", "warning", "error")
+    results = [
+        ReportResult(
+            disease=disease,
+            prediction=rng.randint(0, 1),
+            probability=rng.random(),
+            statuses=[(rng.choice(classes), f"Feature {j} comment for report {i}.") for j in range(rng.randint(3, 15))],
+            advice=[f"Advice {j} for report {i}." for j in range(rng.randint(1, 8))],
+            user_name=f"Patient {i}",
+            age=rng.randint(20, 90),
+            gender=rng.choice(("Male", "Female")),
+        )
+        for i, disease in enumerate(rng.choice(list(REPORTS)) for _ in range(20_000))
+    ]
+
+    start = time.perf_counter()
+    Template(DOCUMENT)
+    print(f"parse DOCUMENT: {(time.perf_counter() - start) * 1e6:.0f} us (done once per disease at import)")
+
+    start = time.perf_counter()
+    total = sum(len(render(result)) for result in results)
+    elapsed = time.perf_counter() - start
+    print(f"{len(results):,} reports in {elapsed * 1000:.0f} ms: {len(results) / elapsed:,.0f} reports/s, "
+          f"{total / len(results) / 1024:.1f} KB each")
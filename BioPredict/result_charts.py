@@ -0,0 +1,175 @@
+import threading
+
+import altair as alt
+
+# Every chart reads its rows from this named dataset and its y-axis limits
+# from top-level params, so the spec itself never changes between
+# predictions. A prediction only fills in the dataset and the param values.
+DATA = alt.Data(name="features")
+
+
+def _ranked_bars(range_color):
+    # Heart and Alzheimer's: bars tallest first, the normal range under each.
+    max_y = alt.param(name="max_y", value=100)
+    base = alt.Chart(DATA).mark_bar().encode(
+        x=alt.X("Feature:N", sort="-y"),
+        y=alt.Y("Value:Q", scale=alt.Scale(domain=[0, alt.ExprRef(max_y.name)])),
+        color=alt.Color("Color:N", scale=None),
+        tooltip=["Feature:N", "Value:Q", "Normal Range:N"],
+    )
+    text = base.mark_text(align="center", baseline="bottom", dy=-5, color="black").encode(
+        text=alt.Text("Value:Q", format=".1f"),
+    )
+    normal_range_text = alt.Chart(DATA).mark_text(
+        align="center", baseline="top", dy=10, fontSize=11, color=range_color,
+    ).encode(x="Feature:N", y=alt.value(0), text="Normal Range:N")
+    return (base + text + normal_range_text).add_params(max_y)
+
+
+def _labels(value_format, font_size):
+    text = alt.Chart(DATA).mark_text(
+        align="center", baseline="bottom", dy=-5, fontSize=font_size, color="black",
+    ).encode(x="Feature:N", y="Value:Q", text=alt.Text("Value:Q", format=value_format))
+    range_text = alt.Chart(DATA).mark_text(
+        align="center", baseline="bottom", dy=-25, fontSize=11, color="#555",
+    ).encode(x="Feature:N", y="Value:Q", text="Normal Range:N")
+    return text, range_text
+
+
+def _diabetes():
+    base = alt.Chart(DATA).mark_bar().encode(
+        y=alt.Y("Value:Q", title="Değer"),
+        x=alt.X("Feature:N", axis=None),
+        color=alt.Color("Color:N", scale=None),
+        tooltip=["Feature:N", "Value:Q", "Normal Range:N"],
+    ).properties(width=120, height=300)
+    text, range_text = _labels(".1f", 13)
+    return (base + text.properties(width=120) + range_text.properties(width=120)).facet(
+        column=alt.Column("Feature:N", title=None, header=alt.Header(labelFontWeight="bold", labelFontSize=14)),
+    )
+
+
+def _parkinson():
+    min_y = alt.param(name="min_y", value=0)
+    max_y = alt.param(name="max_y", value=1)
+    base = alt.Chart(DATA).mark_bar().encode(
+        x=alt.X("Feature:N", axis=alt.Axis(labelAngle=-45)),
+        y=alt.Y("Value:Q", scale=alt.Scale(domain=[alt.ExprRef(min_y.name), alt.ExprRef(max_y.name)])),
+        color=alt.Color("Color:N", scale=None),
+        tooltip=["Feature:N", "Value:Q", "Normal Range:N"],
+    ).properties(width=600, height=300)
+    text, range_text = _labels(".4f", 12)
+    return (base + text + range_text).add_params(min_y, max_y)
+
+
+CHARTS = {
+    "heart": lambda: _ranked_bars("#555"),
+    "diabetes": _diabetes,
+    "parkinson": _parkinson,
+    "alzheimer": lambda: _ranked_bars("#666"),
+}
+
+_specs = {}
+_lock = threading.Lock()
+
+
+def _build(name):
+    spec = CHARTS[name]().to_dict()
+    # to_dict() merges in whichever Altair theme is enabled at the moment,
+    # and Streamlit switches the process-wide theme while it converts
+    # charts. Themes only add config and usermeta, which the charts here do
+    # not set, so both are dropped: the spec is the same whatever another
+    # thread has enabled, and matches Streamlit's own conversion, which
+    # also leaves out the default theme's fixed view size.
+    for key in ("config", "usermeta"):
+        spec.pop(key, None)
+    return spec
+
+
+def _spec(name):
+    with _lock:
+        if name not in _specs:
+            _specs[name] = _build(name)
+    return _specs[name]
+
+
+def spec(name, data, **params):
+    """The Vega-Lite spec of one disease's feature chart with data, a frame
+    of Feature, Value, Color and Normal Range, and values for its y-axis
+    params. Altair builds and validates the spec once per process; each
+    call only copies its top level."""
+    spec = _spec(name)
+    values = {**{param["name"]: param["value"] for param in spec.get("params", ())}, **params}
+    return {
+        **spec,
+        "datasets": {DATA.name: data},
+        **({"params": [{"name": key, "value": value} for key, value in values.items()]} if values else {}),
+    }
+
+
+def show(name, data, use_container_width=True, **params):
+    import streamlit as st
+
+    st.vega_lite_chart(spec(name, data, **params), use_container_width=use_container_width)
+
+
+if __name__ == "__main__":
+    import time
+
+    import pandas as pd
+
+    from timing import best_ms
+
+    data = pd.DataFrame({
+        "Feature": ["Glucose (mg/dL)", "Blood Pressure (mmHg)", "BMI", "Insulin (µU/mL)"],
+        "Value": [148.0, 72.0, 33.6, 80.0],
+        "Color": ["#FFC107", "#4CAF50", "#F44336", "#4CAF50"],
+        "Normal Range": ["Normal: <140", "Normal: <120", "Normal: 18.5–24.9", "Normal: 16–166"],
+    })
+
+    def old_chart(name):
+        # How the pages built the same chart for every prediction.
+        base = alt.Chart(data)
+        if name == "diabetes":
+            bars = base.mark_bar().encode(
+                y=alt.Y("Value:Q", title="Değer"), x=alt.X("Feature:N", axis=None),
+                color=alt.Color("Color:N", scale=None), tooltip=["Feature", "Value", "Normal Range"],
+            ).properties(width=120, height=300)
+            text = base.mark_text(align="center", baseline="bottom", dy=-5, fontSize=13, color="black").encode(
+                x="Feature:N", y="Value:Q", text=alt.Text("Value:Q", format=".1f")).properties(width=120)
+            ranges = base.mark_text(align="center", baseline="bottom", dy=-25, fontSize=11, color="#555").encode(
+                x="Feature:N", y="Value:Q", text="Normal Range:N").properties(width=120)
+            return (bars + text + ranges).facet(column=alt.Column(
+                "Feature:N", title=None, header=alt.Header(labelFontWeight="bold", labelFontSize=14)))
+        if name == "parkinson":
+            bars = base.mark_bar().encode(
+                x=alt.X("Feature:N", axis=alt.Axis(labelAngle=-45)),
+                y=alt.Y("Value:Q", scale=alt.Scale(domain=[0.0, 160.0])),
+                color=alt.Color("Color:N", scale=None), tooltip=["Feature", "Value", "Normal Range"],
+            ).properties(width=600, height=300)
+            text = base.mark_text(align="center", baseline="bottom", dy=-5, fontSize=12, color="black").encode(
+                x="Feature:N", y="Value:Q", text=alt.Text("Value:Q", format=".4f"))
+            ranges = base.mark_text(align="center", baseline="bottom", dy=-25, fontSize=11, color="#555").encode(
+                x="Feature:N", y="Value:Q", text="Normal Range:N")
+            return bars + text + ranges
+        bars = base.mark_bar().encode(
+            x=alt.X("Feature", sort="-y"), y=alt.Y("Value", scale=alt.Scale(domain=[0, 220])),
+            color=alt.Color("Color:N", scale=None), tooltip=["Feature", "Value", "Normal Range"],
+        )
+        text = bars.mark_text(align="center", baseline="bottom", dy=-5, color="black").encode(
+            text=alt.Text("Value", format=".1f"))
+        ranges = base.mark_text(align="center", baseline="top", dy=10, fontSize=11, color="#555").encode(
+            x="Feature:N", y=alt.value(0), text="Normal Range:N")
+        return bars + text + ranges
+
+    params = {"heart": {"max_y": 220}, "diabetes": {}, "parkinson": {"min_y": 0.0, "max_y": 160.0}}
+    for name, values in params.items():
+        start = time.perf_counter()
+        _spec(name)
+        first = time.perf_counter() - start
+
+        # What st.altair_chart did per prediction: build the chart, then
+        # serialize and validate it; against filling in the cached spec.
+        timings = [best_ms(lambda: old_chart(name).to_dict(), 50), best_ms(lambda: spec(name, data, **values), 50)]
+        print(f"{name:<10} build + to_dict {timings[0]:6.2f} ms, cached spec {timings[1] * 1000:5.1f} us "
+              f"({timings[0] / timings[1]:,.0f}x; first build {first * 1000:.1f} ms, once per process)")
@@ -0,0 +1,142 @@
+import argparse
+import csv
+import io
+import mmap
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+import batch_scoring
+import model_registry
+
+DEFAULT_CHUNK_SIZE = 50_000
+DEFAULT_SHARD_BYTES = 4 * 1024 * 1024
+
+# Per-process state set up once by _init_worker.
+_worker = {}
+
+
+def score_file(disease, input_path, output_path, chunk_size=DEFAULT_CHUNK_SIZE):
+    rows = 0
+    with open(output_path, "w", newline="", encoding="utf-8") as out:
+        for chunk in pd.read_csv(input_path, chunksize=chunk_size):
+            try:
+                results = batch_scoring.score(disease, chunk)
+            except ValueError as e:
+                raise ValueError(f"rows {rows + 1}-{rows + len(chunk)}: {e}") from e
+            results.to_csv(out, header=(rows == 0), index=False)
+            rows += len(results)
+    return rows
+
+
+def _shard_offsets(input_path, shard_bytes):
+    # Byte ranges of roughly shard_bytes each, cut at line ends. Rows must not
+    # contain quoted newlines, which holds for every bundled training CSV.
+    with open(input_path, "rb") as f:
+        header = f.readline()
+        start = f.tell()
+        size = os.fstat(f.fileno()).st_size
+        shards = []
+        while start < size:
+            f.seek(min(start + shard_bytes, size))
+            f.readline()
+            end = min(f.tell(), size)
+            shards.append((start, end))
+            start = end
+    columns = next(csv.reader([header.decode("utf-8-sig")]))
+    return columns, shards
+
+
+def _init_worker(disease, input_path, columns):
+    artifacts = model_registry.load(disease)
+    if hasattr(artifacts.get("model"), "get_booster"):
+        # One thread per worker process; the pool provides the parallelism.
+        artifacts["model"].set_params(n_jobs=1)
+    with open(input_path, "rb") as f:
+        _worker["input"] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    _worker["disease"] = disease
+    _worker["columns"] = columns
+
+
+def _score_shard(task):
+    index, start, end, part_path = task
+    chunk = pd.read_csv(io.BytesIO(_worker["input"][start:end]), header=None, names=_worker["columns"])
+    try:
+        results = batch_scoring.score(_worker["disease"], chunk)
+    except ValueError as e:
+        return len(chunk), str(e)
+    results.to_csv(part_path, header=(index == 0), index=False)
+    return len(results), None
+
+
+def score_file_parallel(disease, input_path, output_path, workers, shard_bytes=None):
+    """score_file on a process pool. Each worker memory-maps the input and
+    parses its own byte range, so no rows are pickled; shard outputs are
+    written to part files and joined in input order."""
+    if shard_bytes is None:
+        # At least four shards per worker so uneven shards still balance.
+        shard_bytes = min(DEFAULT_SHARD_BYTES, max(64 * 1024, os.path.getsize(input_path) // (workers * 4)))
+    columns, shards = _shard_offsets(input_path, shard_bytes)
+    out_dir = os.path.dirname(os.path.abspath(output_path))
+    part_dir = tempfile.mkdtemp(prefix=".score_cohort-", dir=out_dir)
+    tasks = [(i, start, end, os.path.join(part_dir, f"{i}.csv")) for i, (start, end) in enumerate(shards)]
+
+    rows = 0
+    try:
+        with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                 initargs=(disease, input_path, columns)) as pool, \
+                open(output_path, "wb") as out:
+            for (_, _, _, part_path), (count, error) in zip(tasks, pool.map(_score_shard, tasks)):
+                if error is not None:
+                    raise ValueError(f"rows {rows + 1}-{rows + count}: {error}")
+                with open(part_path, "rb") as part:
+                    shutil.copyfileobj(part, out)
+                os.remove(part_path)
+                rows += count
+    finally:
+        shutil.rmtree(part_dir, ignore_errors=True)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a cohort CSV with a BioPredict disease model.")
+    parser.add_argument("disease", choices=list(model_registry.ARTIFACTS))
+    parser.add_argument("input", help="cohort CSV in the same shape as the disease's training data")
+    parser.add_argument("output", help="where to write the input rows with Prediction and Probability columns")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"rows read, scored and written per step (default: {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes; 0 means one per CPU (default: 1, no pool)")
+    args = parser.parse_args(argv)
+
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+    if args.workers < 0:
+        parser.error("--workers must be 0 or more")
+    workers = args.workers or os.cpu_count() or 1
+
+    model_registry.load(args.disease)
+
+    start = time.perf_counter()
+    try:
+        if workers > 1:
+            rows = score_file_parallel(args.disease, args.input, args.output, workers)
+        else:
+            rows = score_file(args.disease, args.input, args.output, args.chunk_size)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - start
+
+    rate = rows / elapsed if elapsed > 0 else float("inf")
+    print(f"Scored {rows} rows in {elapsed:.2f}s ({rate:,.0f} rows/s) -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+import sys
+import warnings
+from pathlib import Path
+
+import pytest
+
+# The app's modules import each other by name, as Streamlit runs them from
+# the BioPredict directory.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import model_registry  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _quiet_sklearn():
+    # The pickled models were fitted with another sklearn/xgboost version.
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        yield
+
+
+@pytest.fixture(scope="session")
+def fresh_artifacts():
+    """disease -> artifacts loaded and compiled from the source files, never
+    from biopredict.bundle, so the tests cover the kernel code as it is now."""
+    cache = {}
+
+    def load(disease):
+        if disease not in cache:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                cache[disease] = model_registry.load_from_files(disease)
+        return cache[disease]
+
+    return load
+
+
+def sample_frame(disease):
+    import pandas as pd
+
+    return pd.read_csv(model_registry.ARTIFACT_DIR / model_registry.SAMPLE_DATA[disease])
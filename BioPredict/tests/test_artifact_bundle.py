@@ -0,0 +1,54 @@
+import os
+
+import numpy as np
+
+import artifact_bundle
+
+
+def _no_reads(path):
+    raise AssertionError(f"{path} was read")
+
+
+def _build(tmp_path):
+    source, code = tmp_path / "model.pkl", tmp_path / "kernels.py"
+    source.write_bytes(b"model")
+    code.write_text("KERNEL = 1\n")
+    path = tmp_path / "test.bundle"
+    artifacts = {"demo": {"weights": np.arange(8.0), "names": ["a", "b"]}}
+    artifact_bundle.build(path, artifacts, {"demo": {"model": source}}, ("weights",), {"kernels": code})
+    return artifact_bundle.ArtifactBundle(path), source, code
+
+
+def test_staleness_is_judged_without_reading_the_sources(tmp_path, monkeypatch):
+    bundle, source, code = _build(tmp_path)
+    monkeypatch.setattr(artifact_bundle, "file_sha256", _no_reads)
+    assert bundle.matches_sources("demo", {"model": source})
+    assert bundle.matches_code({"kernels": code})
+
+    code.write_text("KERNEL = 20\n")
+    assert not bundle.matches_code({"kernels": code})
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert not bundle.matches_sources("demo", {"model": source})
+
+
+def test_deep_check_compares_content(tmp_path):
+    bundle, source, code = _build(tmp_path)
+    stat = source.stat()
+    source.write_bytes(b"other")
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert bundle.matches_sources("demo", {"model": source})
+    assert not bundle.matches_sources("demo", {"model": source}, deep=True)
+
+
+def test_each_entry_is_checksummed_once(tmp_path, monkeypatch):
+    bundle, _, _ = _build(tmp_path)
+    digests = []
+    sha256 = artifact_bundle.hashlib.sha256
+    monkeypatch.setattr(artifact_bundle.hashlib, "sha256", lambda *args: digests.append(args) or sha256(*args))
+
+    assert bundle.verify_disease("demo")
+    artifacts = bundle.artifacts("demo")
+    assert np.array_equal(artifacts["weights"], np.arange(8.0))
+    assert artifacts["names"] == ["a", "b"]
+    assert len(digests) == 2
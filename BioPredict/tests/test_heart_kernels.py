@@ -0,0 +1,20 @@
+import numpy as np
+
+import batch_scoring
+import heart_kernels
+from conftest import sample_frame
+
+
+def test_pipeline_matches_sklearn(fresh_artifacts):
+    artifacts = fresh_artifacts("heart")
+    frame = sample_frame("heart")
+    frame["Sex"] = frame["Sex"].replace(batch_scoring.HEART_SEX_VALUES)
+
+    expected_predictions, expected_proba = heart_kernels.sklearn_score(
+        artifacts, frame, batch_scoring.HEART_NUMERIC_COLUMNS
+    )
+    pipeline = artifacts["pipeline"]
+    predictions, proba = pipeline.score(pipeline.encode(frame))
+
+    assert np.array_equal(predictions, expected_predictions)
+    assert np.abs(proba - expected_proba).max() < 1e-12
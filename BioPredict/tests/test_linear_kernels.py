@@ -0,0 +1,33 @@
+import numpy as np
+
+import batch_scoring
+import linear_kernels
+from conftest import sample_frame
+
+
+def _diabetes(fresh_artifacts):
+    artifacts = fresh_artifacts("diabetes")
+    raw = sample_frame("diabetes")[batch_scoring.DIABETES_COLUMNS].astype(float)
+    return artifacts, raw
+
+
+def test_kernel_matches_sklearn(fresh_artifacts):
+    artifacts, raw = _diabetes(fresh_artifacts)
+    expected_predictions, expected_proba = linear_kernels.sklearn_score(artifacts["model"], artifacts["scaler"], raw)
+    predictions, proba = artifacts["kernel"].score(raw)
+
+    assert np.array_equal(predictions, expected_predictions)
+    assert np.abs(proba - expected_proba).max() < 1e-12
+
+
+def test_decision_values_do_not_depend_on_batch_shape(fresh_artifacts):
+    artifacts, raw = _diabetes(fresh_artifacts)
+    kernel = artifacts["kernel"]
+    X = raw.to_numpy()
+
+    batch = kernel.decision_function(X)
+    rows = np.concatenate([kernel.decision_function(X[i:i + 1]) for i in range(len(X))])
+    chunks = np.concatenate([kernel.decision_function(X[i:i + 100]) for i in range(0, len(X), 100)])
+    assert np.array_equal(rows, batch)
+    assert np.array_equal(chunks, batch)
+    assert np.array_equal(kernel.decision_function(np.asfortranarray(X)), batch)
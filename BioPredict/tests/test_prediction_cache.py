@@ -0,0 +1,28 @@
+import importlib
+
+import prediction_cache
+
+
+def test_size_and_ttl_come_from_the_environment(monkeypatch):
+    monkeypatch.setenv("BIOPREDICT_CACHE_SIZE", "3")
+    monkeypatch.setenv("BIOPREDICT_CACHE_TTL", "0.5")
+    try:
+        module = importlib.reload(prediction_cache)
+        assert (module.cache.max_size, module.cache.ttl_seconds) == (3, 0.5)
+    finally:
+        monkeypatch.undo()
+        importlib.reload(prediction_cache)
+
+
+def test_entries_expire_and_the_oldest_is_evicted():
+    now = [0.0]
+    cache = prediction_cache.PredictionCache(max_size=2, ttl_seconds=10, clock=lambda: now[0])
+    for key in "abc":
+        cache.put(key, key.upper())
+    assert cache.get("a") is None
+    assert cache.get("b") == "B"
+
+    now[0] = 10
+    assert cache.get("c") is None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["expirations"] == 1
@@ -0,0 +1,43 @@
+import io
+import zipfile
+
+import report_export
+import report_store
+from benchmark_report_store import synthetic_results
+
+
+def _store(tmp_path):
+    return report_store.ReportStore(tmp_path / "reports.db")
+
+
+def test_reports_belong_to_the_session_not_the_name(tmp_path):
+    store = _store(tmp_path)
+    mine, theirs = report_store.new_session_id(), report_store.new_session_id()
+    results = list(synthetic_results(2))
+    store.add(mine, "Ayse", results[0])
+    store.add(theirs, "Ayse", results[1])
+
+    disease_type = store.disease_types(mine)[0]
+    assert [row["id"] for row in store.page(disease_type, mine)] == [1]
+    assert store.count(disease_type, theirs) == 0
+    assert store.count(disease_type, mine, query="Patient") == 1
+    assert store.count(disease_type, theirs, query="Patient") == 0
+    assert [row["reports"] for row in store.timeline(mine)] == [1]
+    assert [row["id"] for row in store.iter_reports(theirs)] == [2]
+    store.close()
+
+
+def test_anonymous_reports_are_not_pooled(tmp_path):
+    store = _store(tmp_path)
+    first, second = report_store.new_session_id(), report_store.new_session_id()
+    result = next(synthetic_results(1))
+    store.add(first, "", result)
+    store.add(second, "", result)
+
+    for session_id in (first, second):
+        assert store.count(store.disease_types(session_id)[0], session_id) == 1
+    assert store.disease_types("") == []
+    archive = zipfile.ZipFile(io.BytesIO(report_export.zip_bytes(store, first)))
+    assert [name for name in archive.namelist() if name.endswith(".html")] == [report_export._file_name(
+        next(store.iter_reports(first)))]
+    store.close()
@@ -0,0 +1,20 @@
+import altair as alt
+import pytest
+
+import result_charts
+
+
+@pytest.mark.parametrize("name", list(result_charts.CHARTS))
+def test_spec_does_not_depend_on_the_active_theme(name):
+    spec = result_charts._build(name)
+    for theme in ("none", "default", "dark"):
+        with alt.theme.enable(theme):
+            assert result_charts._build(name) == spec
+    assert "config" not in spec
+
+
+def test_spec_fills_in_data_and_params():
+    rows = [{"Feature": "BMI", "Value": 31.0, "Color": "#F44336", "Normal Range": "Normal: 18.5–24.9"}]
+    spec = result_charts.spec("parkinson", rows, max_y=40)
+    assert spec["datasets"] == {result_charts.DATA.name: rows}
+    assert spec["params"] == [{"name": "min_y", "value": 0}, {"name": "max_y", "value": 40}]
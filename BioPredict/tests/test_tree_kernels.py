@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+import batch_scoring
+from conftest import sample_frame
+from tree_kernels import CompiledForest
+
+XGBOOST_DISEASES = ["parkinson", "thyroid", "alzheimer"]
+
+
+@pytest.mark.parametrize("disease", XGBOOST_DISEASES)
+def test_forest_matches_xgboost_bit_for_bit(disease, fresh_artifacts):
+    model = fresh_artifacts(disease)["model"]
+    forest = CompiledForest.from_xgboost(model)
+    X = batch_scoring.prepare(disease, sample_frame(disease))
+
+    expected = model.predict_proba(X)
+    actual = forest.predict_proba(X)
+    assert actual.dtype == expected.dtype
+    assert np.array_equal(actual, expected)
+
+
+@pytest.mark.parametrize("disease", XGBOOST_DISEASES)
+def test_forest_scores_a_row_the_same_alone_or_in_a_batch(disease, fresh_artifacts):
+    forest = fresh_artifacts(disease)["forest"]
+    X = batch_scoring.prepare(disease, sample_frame(disease))
+    X = X.to_numpy() if hasattr(X, "to_numpy") else X
+
+    batch = forest.predict_proba(X)
+    rows = np.concatenate([forest.predict_proba(X[i:i + 1]) for i in range(0, len(X), 7)])
+    assert np.array_equal(rows, batch[::7])
@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+
+# Labels that mean a training category but are spelled differently: the raw
+# codes of Thyroid_Diff.csv (the replacements Thyroid.ipynb applied before
+# training) and the labels ThyroidPage.py shows. Labels with no training
+# counterpart map to None and are scored as missing, as they always were.
+THYROID_ALIASES = {
+    'Gender': {
+        'Female': 'F',
+        'Male': 'M',
+    },
+    'Thyroid Function': {
+        'Normal': 'Euthyroid',
+        'Hypo': None,
+        'Hyper': None,
+    },
+    'Physical Examination': {
+        'Abnormal': None,
+    },
+    'Adenopathy': {
+        'No': 'No Lympth Adenopathy',
+        'Left': 'Left Side Body Adenopathy',
+        'Right': 'Right Side Body Adenopathy',
+        'Extensive': 'Extensive and Widespread',
+    },
+    'Types of Thyroid Cancer (Pathology)': {
+        'Other': None,
+    },
+    'Focality': {
+        'Unifocal': 'Uni-Focal',
+        'Multifocal': 'Multi-Focal',
+    },
+    'Tumor': {
+        'T1a': 'tumor that is 1 cm or smaller',
+        'T1b': 'tumor larger than 1 cm but not larger than 2 cm',
+        'T2': 'tumor larger than 2 cm but not larger than 4 cm',
+        'T3a': 'tumor larger than 4 cm',
+        'T3b': 'tumor that has grown outside the thyroid',
+        'T4a': 'tumor that has invaded nearby structures',
+        'T4b': 'tumor that has invaded nearby structures',
+    },
+    'Lymph Nodes': {
+        'N0': 'no evidence of regional lymph node metastasis',
+        'N1b': 'regional lymph node metastasis in the central of the neck',
+        'N1a': 'regional lymph node metastasis in the lateral of the neck',
+        'No evidence of regional lymph node metastasis': 'no evidence of regional lymph node metastasis',
+        'Regional lymph node metastasis in the central neck': 'regional lymph node metastasis in the central of the neck',
+        'Regional lymph node metastasis in the lateral neck': 'regional lymph node metastasis in the lateral of the neck',
+    },
+    'Stage': {
+        'I': 'First-Stage',
+        'II': 'Second-Stage',
+        'III': 'Third-Stage',
+    },
+}
+
+
+class ThyroidCodeTables:
+    """category_mappings.pkl and the Age scaler as plain lookup tables.
+
+    encode() turns labels straight into the integer category codes XGBoost
+    was trained on, in the model's column order, so both the compiled forest
+    and xgboost itself score the same pre-coded float32 matrix.
+    """
+
+    def __init__(self, feature_names, codes, age_scale, age_min):
+        self.feature_names = list(feature_names)
+        self.codes = codes
+        self.age_scale = age_scale
+        self.age_min = age_min
+
+    @classmethod
+    def from_artifacts(cls, category_mappings, scaler, feature_names):
+        if not hasattr(scaler, "min_"):
+            raise ValueError("The Thyroid Age scaler must be a MinMaxScaler.")
+        if len(scaler.scale_) != 1 or list(getattr(scaler, "feature_names_in_", ["Age"])) != ["Age"]:
+            raise ValueError("The Thyroid Age scaler must be fitted on Age alone.")
+
+        codes = {}
+        for col, categories in category_mappings.items():
+            table = {category: float(code) for code, category in enumerate(categories)}
+            for alias, category in THYROID_ALIASES.get(col, {}).items():
+                table.setdefault(alias, np.nan if category is None else table[category])
+            codes[col] = table
+        return cls(feature_names, codes, float(scaler.scale_[0]), float(scaler.min_[0]))
+
+    def encode(self, frame):
+        """Patient labels to a float32 matrix; frame is a DataFrame or a dict
+        of equal-length columns. Missing labels become NaN, unknown ones raise
+        ValueError."""
+        n_rows = len(frame[self.feature_names[0]])
+        X = np.empty((n_rows, len(self.feature_names)), dtype=np.float32)
+        for j, col in enumerate(self.feature_names):
+            if col == 'Age':
+                # MinMaxScaler.transform: X *= scale_; X += min_
+                X[:, j] = np.asarray(frame[col], dtype=np.float64) * self.age_scale + self.age_min
+                continue
+
+            table = self.codes[col]
+            values = [None if pd.isna(value) else str(value).strip() for value in frame[col]]
+            unknown = sorted({value for value in values if value and value not in table})
+            if unknown:
+                count = sum(value in unknown for value in values)
+                raise ValueError(f"Unknown values for {col} in {count} rows: {', '.join(unknown[:5])}")
+            X[:, j] = [table[value] if value else np.nan for value in values]
+        return X
@@ -0,0 +1,12 @@
+import time
+
+
+def best_ms(fn, repeat):
+    """The fastest of repeat calls to fn, in ms. The minimum is the run
+    least disturbed by whatever else the machine was doing."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
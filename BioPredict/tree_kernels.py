@@ -0,0 +1,261 @@
+import ctypes
+import ctypes.util
+import json
+
+import numpy as np
+
+from feature_matrix import as_matrix
+
+FOREST_FIELDS = (
+    "roots", "feature", "threshold", "left", "right",
+    "default_left", "is_categorical", "category_mask", "leaf_value",
+)
+
+
+def _load_expf():
+    # XGBoost's sigmoid calls the C library's single-precision expf, which is
+    # not always correctly rounded. Calling the same function keeps the
+    # probabilities bit-identical, not just within one float32 ulp.
+    for name in (None, ctypes.util.find_library("m"), ctypes.util.find_library("c")):
+        try:
+            expf = ctypes.CDLL(name).expf
+        except (OSError, AttributeError, TypeError):
+            continue
+        expf.restype = ctypes.c_float
+        expf.argtypes = [ctypes.c_float]
+        return np.frompyfunc(expf, 1, 1)
+    return None
+
+
+_expf = _load_expf()
+
+
+def expf(x):
+    x = np.asarray(x, dtype=np.float32)
+    if _expf is None:
+        return np.exp(x.astype(np.float64)).astype(np.float32)
+    return _expf(x).astype(np.float32)
+
+
+class CompiledForest:
+    """Flattened tree ensemble evaluated with NumPy only.
+
+    All trees live in one set of contiguous node arrays. Leaves point to
+    themselves, so every row walks a fixed number of steps. Margins are
+    accumulated in the dtype of leaf_value: float32 for XGBoost, float64 for
+    sklearn gradient boosting.
+    """
+
+    def __init__(self, roots, feature, threshold, left, right, default_left,
+                 is_categorical, category_mask, leaf_value, base_margin, depth,
+                 feature_names=None):
+        self.roots = roots
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.default_left = default_left
+        self.is_categorical = is_categorical
+        self.category_mask = category_mask
+        self.leaf_value = leaf_value
+        self.base_margin = leaf_value.dtype.type(base_margin)
+        self.depth = int(depth)
+        self.has_categorical = bool(is_categorical.any())
+        self.feature_names = list(feature_names) if feature_names is not None else None
+
+    @classmethod
+    def from_xgboost(cls, model):
+        learner = json.loads(model.get_booster().save_raw("json"))["learner"]
+        if learner["objective"]["name"] != "binary:logistic":
+            raise ValueError(f"Unsupported objective: {learner['objective']['name']}")
+
+        base_score = np.float32(json.loads(learner["learner_model_param"]["base_score"])[0])
+        base_margin = -np.log(np.float32(1) / base_score - np.float32(1))
+
+        trees = learner["gradient_booster"]["model"]["trees"]
+        n_nodes = sum(len(tree["left_children"]) for tree in trees)
+        n_categories = 1 + max((max(tree["categories"], default=-1) for tree in trees), default=-1)
+
+        roots = np.empty(len(trees), dtype=np.int32)
+        feature = np.zeros(n_nodes, dtype=np.int32)
+        threshold = np.zeros(n_nodes, dtype=np.float32)
+        left = np.empty(n_nodes, dtype=np.int32)
+        right = np.empty(n_nodes, dtype=np.int32)
+        default_left = np.zeros(n_nodes, dtype=bool)
+        is_categorical = np.zeros(n_nodes, dtype=bool)
+        # One spare column that is never set, for codes no split has seen.
+        category_mask = np.zeros((n_nodes, n_categories + 1), dtype=bool)
+        leaf_value = np.zeros(n_nodes, dtype=np.float32)
+        depth = 0
+
+        offset = 0
+        for t, tree in enumerate(trees):
+            size = len(tree["left_children"])
+            nodes = np.arange(offset, offset + size, dtype=np.int32)
+            tree_left = np.asarray(tree["left_children"], dtype=np.int32)
+            tree_right = np.asarray(tree["right_children"], dtype=np.int32)
+            leaf = tree_left == -1
+
+            roots[t] = offset
+            left[nodes] = np.where(leaf, nodes, tree_left + offset)
+            right[nodes] = np.where(leaf, nodes, tree_right + offset)
+            feature[nodes] = np.where(leaf, 0, tree["split_indices"])
+            conditions = np.asarray(tree["split_conditions"], dtype=np.float32)
+            threshold[nodes] = np.where(leaf, 0, conditions)
+            leaf_value[nodes] = np.where(leaf, conditions, 0)
+            default_left[nodes] = np.asarray(tree["default_left"], dtype=bool)
+            is_categorical[nodes] = np.asarray(tree["split_type"]) == 1
+
+            segments = tree["categories_segments"]
+            for node, start, count in zip(tree["categories_nodes"], segments, tree["categories_sizes"]):
+                category_mask[offset + node, tree["categories"][start:start + count]] = True
+
+            depth = max(depth, _tree_depth(tree_left, tree_right))
+            offset += size
+
+        return cls(roots, feature, threshold, left, right, default_left,
+                   is_categorical, category_mask, leaf_value, base_margin, depth,
+                   learner.get("feature_names") or None)
+
+    @classmethod
+    def from_sklearn_gb(cls, model):
+        if len(model.classes_) != 2 or model.estimators_.shape[1] != 1:
+            raise ValueError("Only binary GradientBoostingClassifier models can be compiled.")
+
+        # The init estimator is a constant prior, so one dummy row gives it.
+        base_margin = model._raw_predict_init(np.zeros((1, model.n_features_in_), dtype=np.float32))[0, 0]
+        trees = [estimator.tree_ for estimator in model.estimators_[:, 0]]
+        n_nodes = sum(tree.node_count for tree in trees)
+
+        roots = np.empty(len(trees), dtype=np.int32)
+        feature = np.zeros(n_nodes, dtype=np.int32)
+        threshold = np.zeros(n_nodes, dtype=np.float32)
+        left = np.empty(n_nodes, dtype=np.int32)
+        right = np.empty(n_nodes, dtype=np.int32)
+        leaf_value = np.zeros(n_nodes, dtype=np.float64)
+        depth = 0
+
+        offset = 0
+        for t, tree in enumerate(trees):
+            nodes = np.arange(offset, offset + tree.node_count, dtype=np.int32)
+            leaf = tree.children_left == -1
+
+            roots[t] = offset
+            left[nodes] = np.where(leaf, nodes, tree.children_left + offset)
+            right[nodes] = np.where(leaf, nodes, tree.children_right + offset)
+            feature[nodes] = np.where(leaf, 0, tree.feature)
+            threshold[nodes] = np.where(leaf, 0, _float32_above(tree.threshold))
+            # sklearn adds learning_rate * value stage by stage, in float64.
+            leaf_value[nodes] = np.where(leaf, model.learning_rate * tree.value[:, 0, 0], 0)
+
+            depth = max(depth, tree.max_depth)
+            offset += tree.node_count
+
+        no_split = np.zeros(n_nodes, dtype=bool)
+        return cls(roots, feature, threshold, left, right, no_split,
+                   no_split, np.zeros((n_nodes, 1), dtype=bool), leaf_value, base_margin, depth)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            arrays = {name: data[name] for name in FOREST_FIELDS}
+            feature_names = data["feature_names"].tolist() if "feature_names" in data else None
+            return cls(**arrays, base_margin=data["base_margin"][()], depth=data["depth"][()],
+                       feature_names=feature_names)
+
+    def save(self, path):
+        arrays = {name: getattr(self, name) for name in FOREST_FIELDS}
+        if self.feature_names is not None:
+            arrays["feature_names"] = np.asarray(self.feature_names, dtype=str)
+        np.savez(path, base_margin=self.base_margin, depth=self.depth, **arrays)
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in FOREST_FIELDS)
+
+    def leaves(self, X):
+        X = as_matrix(X, self.feature_names)
+        n_rows, n_columns = X.shape
+        values = X.ravel()
+        has_missing = bool(np.isnan(values).any())
+        n_categories = self.category_mask.shape[1]
+        category_mask = self.category_mask.ravel()
+
+        row_offset = (np.arange(n_rows, dtype=np.intp) * n_columns)[:, None]
+        node = np.broadcast_to(self.roots, (n_rows, self.roots.size))
+        for _ in range(self.depth):
+            value = values.take(row_offset + self.feature.take(node))
+            go_left = value < self.threshold.take(node)
+            if self.has_categorical:
+                codes = np.clip(np.nan_to_num(value), 0, n_categories - 1).astype(np.intp)
+                # XGBoost sends the categories stored on a node to the right child.
+                in_set = category_mask.take(node * n_categories + codes)
+                go_left = np.where(self.is_categorical.take(node), ~in_set, go_left)
+            if has_missing:
+                go_left = np.where(np.isnan(value), self.default_left.take(node), go_left)
+            node = np.where(go_left, self.left.take(node), self.right.take(node))
+        return self.leaf_value.take(node)
+
+    def predict_margin(self, X):
+        leaves = self.leaves(X)
+        # Accumulate tree by tree, in the same order and precision as the
+        # library the model came from.
+        dtype = self.leaf_value.dtype
+        start = np.full((leaves.shape[0], 1), self.base_margin, dtype=dtype)
+        return np.cumsum(np.hstack([start, leaves]), axis=1, dtype=dtype)[:, -1]
+
+    def predict_proba(self, X):
+        margin = self.predict_margin(X)
+        if margin.dtype == np.float64:
+            positive = 1 / (1 + np.exp(-margin))
+            return np.column_stack([1 - positive, positive])
+        exp = expf(np.minimum(-margin, np.float32(88.7)))
+        positive = np.float32(1) / (exp + np.float32(1))
+        return np.column_stack([np.float32(1) - positive, positive])
+
+    def predict(self, X):
+        return (self.predict_proba(X)[:, 1] > 0.5).astype(int)
+
+
+def _float32_above(threshold):
+    # sklearn tests float32(x) <= threshold (float64). For float32 x that is
+    # x < the next float32 above the largest float32 not exceeding threshold.
+    below = threshold.astype(np.float32)
+    below = np.where(below > threshold, np.nextafter(below, np.float32(-np.inf)), below)
+    return np.nextafter(below, np.float32(np.inf))
+
+
+def _tree_depth(left, right):
+    depth = np.zeros(left.size, dtype=np.int32)
+    for node in range(left.size):
+        if left[node] != -1:
+            depth[left[node]] = depth[right[node]] = depth[node] + 1
+    return int(depth.max())
+
+
+if __name__ == "__main__":
+    import warnings
+
+    import pandas as pd
+
+    import batch_scoring
+    import model_registry
+    from timing import best_ms
+
+    warnings.filterwarnings("ignore")
+
+    # Bit-equality with XGBoost is checked by tests/test_tree_kernels.py.
+    for disease in ("parkinson", "thyroid", "alzheimer"):
+        model = model_registry.load(disease)["model"]
+        forest = CompiledForest.from_xgboost(model)
+        data = pd.read_csv(model_registry.ARTIFACT_DIR / model_registry.SAMPLE_DATA[disease])
+        X = batch_scoring.prepare(disease, data)
+
+        row = X[:1]
+        print(f"{disease}: {len(X)} rows")
+        print(f"  1 row     xgboost {best_ms(lambda: model.predict_proba(row), 200):7.3f} ms"
+              f"   compiled {best_ms(lambda: forest.predict_proba(row), 200):7.3f} ms")
+        print(f"  {len(X):<5} rows xgboost {best_ms(lambda: model.predict_proba(X), 20):7.3f} ms"
+              f"   compiled {best_ms(lambda: forest.predict_proba(X), 20):7.3f} ms")
+        print(f"  model size xgboost {len(model.get_booster().save_raw('ubj')) / 1024:7.1f} KB"
+              f"   compiled {forest.nbytes / 1024:7.1f} KB")
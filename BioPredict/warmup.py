@@ -0,0 +1,106 @@
+import importlib
+import os
+import sys
+import threading
+import time
+
+import model_registry
+
+# Set BIOPREDICT_WARMUP=0 to skip the warm-up, e.g. while editing pages.
+ENABLED = os.environ.get("BIOPREDICT_WARMUP", "1") != "0"
+# What the pages import once a prediction is shown, imported after the
+# models so a page's first result panel finds them loaded.
+PRELOAD_MODULES = ("altair", "prediction_cache", "result_charts")
+
+_start_lock = threading.Lock()
+_thread = None
+_ready = {disease: threading.Event() for disease in model_registry.ARTIFACTS}
+
+# disease -> {"state": "pending" | "ready" | "failed", "elapsed_ms": ..., "error": ...}
+status = {disease: {"state": "pending"} for disease in model_registry.ARTIFACTS}
+
+
+def warm(disease):
+    """Load one disease's artifacts and push bundled rows through its full
+    pipeline: one row on the compiled kernel, then the whole file on the
+    batch path, so every first call a user could trigger has been made."""
+    import pandas as pd
+
+    import batch_scoring
+
+    model_registry.load(disease)
+    sample = pd.read_csv(model_registry.ARTIFACT_DIR / model_registry.SAMPLE_DATA[disease])
+    batch_scoring.predict(disease, batch_scoring.prepare(disease, sample.head(1)))
+    batch_scoring.predict(disease, batch_scoring.prepare(disease, sample))
+
+
+def _run():
+    for disease in model_registry.ARTIFACTS:
+        start = time.perf_counter()
+        try:
+            warm(disease)
+        except Exception as e:
+            # The page's own load raises the real error when a user predicts.
+            status[disease] = {"state": "failed", "error": str(e)}
+        else:
+            status[disease] = {"state": "ready", "elapsed_ms": (time.perf_counter() - start) * 1000}
+        _ready[disease].set()
+
+    for module in PRELOAD_MODULES:
+        importlib.import_module(module)
+
+
+def start():
+    """Start the warm-up thread once per process; later calls are no-ops."""
+    global _thread
+    with _start_lock:
+        if _thread is None and ENABLED:
+            # Streamlit puts the app's directory on sys.path only while a
+            # script runs, and removes its own entry afterwards. This thread
+            # imports the app's modules in between runs, so it keeps one.
+            sys.path.append(str(model_registry.ARTIFACT_DIR))
+            _thread = threading.Thread(target=_run, name="biopredict-warmup", daemon=True)
+            _thread.start()
+    return _thread
+
+
+def is_ready(disease=None):
+    """True once the warm-up has finished with disease (or with every
+    disease), or when no warm-up is running, so there is nothing to wait for."""
+    if _thread is None:
+        return True
+    if disease is None:
+        return all(event.is_set() for event in _ready.values())
+    return _ready[disease].is_set()
+
+
+def wait(disease, timeout=None):
+    if _thread is not None:
+        _ready[disease].wait(timeout)
+    return is_ready(disease)
+
+
+def ready_count():
+    return sum(event.is_set() for event in _ready.values())
+
+
+if __name__ == "__main__":
+    import pandas as pd
+
+    import batch_scoring
+    import prediction_cache
+
+    began = time.perf_counter()
+    thread = start()
+    print(f"start() returned in {(time.perf_counter() - began) * 1000:.2f} ms")
+    thread.join()
+    print(f"all models ready after {(time.perf_counter() - began) * 1000:.0f} ms")
+    for disease, state in status.items():
+        print(f"  {disease:<10} {state['state']:<7} {state.get('elapsed_ms', 0):7.0f} ms {state.get('error', '')}")
+
+    # A user's first prediction now finds everything loaded.
+    for disease in model_registry.ARTIFACTS:
+        row = pd.read_csv(model_registry.ARTIFACT_DIR / model_registry.SAMPLE_DATA[disease]).tail(1)
+        begin = time.perf_counter()
+        prediction_cache.predict(disease, batch_scoring.prepare(disease, row))
+        print(f"  first {disease} prediction after warm-up: {(time.perf_counter() - begin) * 1000:.1f} ms")